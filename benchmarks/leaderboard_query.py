@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+
+"""Time leaderboard queries over a large history of games.
+
+Usage:
+    python3 benchmarks/leaderboard_query.py [GAMES]
+
+Fills a leaderboard in a temporary directory with GAMES (default
+1,000,000) random games by 10,000 players in 10 categories over the last
+year, then reports how long each kind of leaderboard query takes.
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter, time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hangman'))
+
+# pylint: disable=wrong-import-position
+from engine import GameRecord  # noqa: E402
+from leaderboard import SECONDS_PER_DAY, Leaderboard  # noqa: E402
+
+PLAYERS = [f'Player {idx}' for idx in range(10_000)]
+CATEGORIES = [f'category {idx}' for idx in range(10)]
+QUERIES = {
+    'overall': {},
+    'category': {'category': 'category 3'},
+    'last 7 days': {'days': 7},
+    'category, last 7 days': {'category': 'category 3', 'days': 7},
+}
+
+
+def random_games(count: int, rng: random.Random):
+    """Yield count random GameRecords."""
+    now = time()
+    for _ in range(count):
+        yield GameRecord(now - rng.random() * 365 * SECONDS_PER_DAY,
+                         rng.choice(PLAYERS), rng.choice(CATEGORIES),
+                         'WORD', ('W', 'O', 'R', 'D'), rng.random() < 0.6)
+
+
+def main() -> None:
+    """Fill a leaderboard and time queries."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with Leaderboard(Path(tmp_dir) / 'leaderboard.db') as leaderboard:
+            start = perf_counter()
+            leaderboard.add_records(random_games(games, random.Random(0)))
+            elapsed = perf_counter() - start
+            print(f"Added {games:,} games in {elapsed:.1f} s "
+                  f"({games / elapsed:,.0f} games/s)")
+            for name, kwargs in QUERIES.items():
+                runs = 20
+                start = perf_counter()
+                for _ in range(runs):
+                    leaderboard.top(10, **kwargs)
+                elapsed = (perf_counter() - start) / runs
+                print(f"Top 10 {name + ':':<23}{elapsed * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
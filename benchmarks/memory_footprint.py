@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+
+"""Compare the memory footprint of WordStore with list[str].
+
+Usage:
+    python3 benchmarks/memory_footprint.py [WORD_FILE]
+
+WORD_FILE defaults to the system dictionary. The words are loaded both as
+a list of str (as the game stored them before WordStore) and as a
+WordStore, and the memory allocated for each is reported.
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hangman'))
+
+# pylint: disable=wrong-import-position
+from lexicon import find_system_dictionary  # noqa: E402
+from wordsource import WordStore  # noqa: E402
+
+
+def allocated(build) -> tuple[object, int]:
+    """Return result of build() and the bytes allocated to keep it."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main() -> None:
+    """Print memory used by each representation of the word list."""
+    word_file = (Path(sys.argv[1]) if len(sys.argv) > 1
+                 else find_system_dictionary())
+    if word_file is None:
+        sys.exit("No word file found.")
+    lines = word_file.read_text(encoding='utf-8',
+                                errors='replace').splitlines()
+
+    def build_list() -> list[str]:
+        return [line.strip().upper() for line in lines if line.strip()]
+
+    word_list, list_size = allocated(build_list)
+    store, store_size = allocated(lambda: WordStore(build_list()))
+    assert list(store) == word_list
+
+    print(f"Words:      {len(word_list):>12,}")
+    print(f"list[str]:  {list_size:>12,} bytes")
+    print(f"WordStore:  {store_size:>12,} bytes "
+          f"({store_size / list_size:.0%} of list)")
+
+
+if __name__ == '__main__':
+    main()
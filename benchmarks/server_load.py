@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+
+"""Drive many simulated clients against the Hangman server.
+
+Usage:
+    python3 benchmarks/server_load.py [CLIENTS] [GAMES]
+
+Starts a HangmanServer on a loopback port in this process, then:
+
+1. Connects CLIENTS clients (default 500) which stop at the first prompt,
+   and reports the memory allocated per idle session. The figure includes
+   the client end of each connection, which runs in the same process.
+2. Has every client play GAMES games (default 5), guessing letters in
+   LETTER_FREQUENCY_ORDER, and reports games per second.
+"""
+
+import asyncio
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hangman'))
+
+# pylint: disable=wrong-import-position
+from server import (AGAIN_PROMPT, CATEGORY_PROMPT, GUESS_PROMPT,  # noqa: E402
+                    NAME_PROMPT, PROMPTS, HangmanServer)
+from solver import LETTER_FREQUENCY_ORDER  # noqa: E402
+
+# Most connection attempts in progress at once.
+CONNECT_BURST = 100
+
+
+def raise_file_limit(wanted: int) -> None:
+    """Raise the open file limit towards wanted, where supported."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        new_soft = wanted if hard == resource.RLIM_INFINITY else min(wanted,
+                                                                     hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+
+
+async def read_prompt(reader: asyncio.StreamReader) -> str:
+    """Return the next prompt from the server."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        prompt = line.decode().rstrip('\n')
+        if prompt in PROMPTS:
+            return prompt
+
+
+class Client:
+    """A simulated player."""
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.games = 0
+
+    async def answer(self, text: str) -> str:
+        """Send text and return the next prompt."""
+        self.writer.write(text.encode() + b'\n')
+        await self.writer.drain()
+        return await read_prompt(self.reader)
+
+    async def play(self, games: int) -> None:
+        """Answer the name prompt, then play games games."""
+        prompt = await self.answer('bench')
+        guesses = iter(LETTER_FREQUENCY_ORDER)
+        while True:
+            if prompt == CATEGORY_PROMPT:
+                prompt = await self.answer('1')
+            elif prompt == GUESS_PROMPT:
+                prompt = await self.answer(next(guesses))
+            elif prompt == AGAIN_PROMPT:
+                self.games += 1
+                guesses = iter(LETTER_FREQUENCY_ORDER)
+                if self.games == games:
+                    self.writer.write(b'n\n')
+                    await self.writer.drain()
+                    break
+                prompt = await self.answer('y')
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def connect(port: int, limit: asyncio.Semaphore) -> Client:
+    """Return a client connected and waiting at the name prompt."""
+    async with limit:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    if await read_prompt(reader) != NAME_PROMPT:
+        raise ConnectionError("Unexpected first prompt.")
+    return Client(reader, writer)
+
+
+async def run(clients: int, games: int) -> None:
+    """Run the benchmark and print the results."""
+    hangman_server = HangmanServer()
+    server = await hangman_server.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    limit = asyncio.Semaphore(CONNECT_BURST)
+    tracemalloc.start()
+    start = perf_counter()
+    players = await asyncio.gather(*(connect(port, limit)
+                                     for _ in range(clients)))
+    elapsed = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Idle sessions:    {hangman_server.connections:,}")
+    print(f"Connect time:     {elapsed:.2f} s")
+    print(f"Memory / session: {size / clients / 1024:.1f} KiB")
+
+    start = perf_counter()
+    await asyncio.gather(*(player.play(games) for player in players))
+    elapsed = perf_counter() - start
+    total = sum(player.games for player in players)
+    print(f"Games:            {total:,}")
+    print(f"Throughput:       {total / elapsed:,.0f} games/s")
+    while hangman_server.connections:
+        await asyncio.sleep(0.01)
+    server.close()
+    await server.wait_closed()
+    hangman_server.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    raise_file_limit(2 * clients + 64)
+    asyncio.run(run(clients, games))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/python3
+
+"""Benchmark the main code paths and compare with a saved baseline.
+
+Usage:
+    python3 benchmarks/suite.py [--baseline FILE] [--save] [--output FILE]
+                                [--threshold PCT] [--only NAME ...]
+
+Each benchmark reports the best time per operation over REPEATS runs:
+
+- import_lexicon_cold: import lexicon in a new interpreter, with no
+  compiled bytecode.
+- import_lexicon_warm: the same, with bytecode already compiled.
+- get_secret_word: one draw from a loaded category.
+- update_state_on_guess: GameState.update_state_on_guess, per guess.
+- update_puzzle: GameState.update_puzzle, per correct guess.
+- update_screen: UI.update_screen, drawing to an in-memory terminal.
+- engine_game: a whole game of scripted guesses with GameEngine.
+- full_game: a whole game of scripted guesses with Hangman.play_game,
+  drawing to an in-memory terminal.
+
+If the baseline file (default: benchmarks/baseline.json) exists, each
+result is compared with it, and the exit status is 1 if any benchmark is
+slower than its baseline by more than its threshold. --save replaces the
+baseline with this run. Baselines depend on the machine, so save one
+before making changes and compare on the same machine. On a busy or
+shared machine, raise --threshold or run the comparison again.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter_ns
+
+HANGMAN_DIR = Path(__file__).resolve().parent.parent / 'hangman'
+sys.path.insert(0, str(HANGMAN_DIR))
+
+# pylint: disable=wrong-import-position
+from engine import GameEngine  # noqa: E402
+from gamestate import GameState, get_secret_word  # noqa: E402
+from hangman import UI, Hangman  # noqa: E402
+from lexicon import lexicon_dict  # noqa: E402
+from solver import LETTER_FREQUENCY_ORDER  # noqa: E402
+from terminal import Pacer, Screen  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+CATEGORY = 'animals'
+REPEATS = 7
+GAMES = 200
+# Times each run of a per-guess benchmark plays the scripted games.
+ROUNDS = 20
+
+# Largest slowdown, as a fraction of the baseline, that is not reported.
+DEFAULT_THRESHOLD = 0.25
+# Starting an interpreter is noisier than the in-process benchmarks.
+THRESHOLDS = {'import_lexicon_cold': 0.5, 'import_lexicon_warm': 0.5}
+
+Script = tuple[str, tuple[str, ...]]
+
+
+def best_ns(run: Callable[[], int], repeats: int = REPEATS) -> float:
+    """Return the best time per operation, in ns, of repeats runs.
+
+    run() does the work and returns the number of operations it did.
+    """
+    best = math.inf
+    for _ in range(repeats):
+        start = perf_counter_ns()
+        ops = run()
+        best = min(best, (perf_counter_ns() - start) / ops)
+    return best
+
+
+def scripted_games(count: int) -> list[Script]:
+    """Return (word, guesses) of count games.
+
+    Each game guesses letters in LETTER_FREQUENCY_ORDER until it ends,
+    so the scripts are the same on every run.
+    """
+    words = sorted(set(lexicon_dict[CATEGORY].word_list))
+    engine = GameEngine()
+    scripts = []
+    for word in random.Random(0).sample(words, min(count, len(words))):
+        engine.start(word)
+        guesses = []
+        for letter in LETTER_FREQUENCY_ORDER:
+            guesses.append(letter)
+            if engine.guess(letter).is_over:
+                break
+        scripts.append((engine.state.word, tuple(guesses)))
+    return scripts
+
+
+def bench_import(cold: bool) -> float:
+    """Time importing lexicon in a new interpreter, less startup time."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+
+        def run(code: str) -> int:
+            if cold:
+                for path in Path(cache_dir).glob('**/*.pyc'):
+                    path.unlink()
+            subprocess.run([sys.executable, '-c', code], cwd=HANGMAN_DIR,
+                           env=env, check=True)
+            return 1
+
+        run('import lexicon')
+        return (best_ns(lambda: run('import lexicon'))
+                - best_ns(lambda: run('pass')))
+
+
+def bench_get_secret_word() -> float:
+    """Time drawing a secret word."""
+    get_secret_word(CATEGORY)
+    draws = 100_000
+
+    def run() -> int:
+        for _ in range(draws):
+            get_secret_word(CATEGORY)
+        return draws
+
+    return best_ns(run)
+
+
+def bench_update_state(scripts: list[Script]) -> float:
+    """Time GameState.update_state_on_guess."""
+    state = GameState()
+
+    def run() -> int:
+        guesses = 0
+        for _ in range(ROUNDS):
+            for word, script in scripts:
+                state.reset_current_game()
+                state.word = word
+                state.initialise_game_state()
+                for guess in script:
+                    state.current_guess = guess
+                    state.update_state_on_guess()
+                guesses += len(script)
+        return guesses
+
+    return best_ns(run)
+
+
+def bench_update_puzzle(scripts: list[Script]) -> float:
+    """Time GameState.update_puzzle."""
+    state = GameState()
+    correct = [(word, tuple(guess for guess in script if guess in word))
+               for word, script in scripts]
+
+    def run() -> int:
+        guesses = 0
+        for _ in range(ROUNDS):
+            for word, script in correct:
+                state.reset_current_game()
+                state.word = word
+                state.initialise_game_state()
+                for guess in script:
+                    state.current_guess = guess
+                    state.update_puzzle()
+                guesses += len(script)
+        return guesses
+
+    return best_ns(run)
+
+
+def bench_update_screen(scripts: list[Script]) -> float:
+    """Time UI.update_screen."""
+    engine = GameEngine()
+    ui = UI(engine.state, Pacer(math.inf))
+    terminal = io.StringIO()
+    ui.screen = Screen(terminal, ansi=True)
+
+    def run() -> int:
+        frames = 0
+        for word, script in scripts:
+            engine.start(word)
+            for guess in script:
+                engine.guess(guess)
+                ui.update_screen()
+            frames += len(script)
+            terminal.seek(0)
+            terminal.truncate()
+        return frames
+
+    return best_ns(run)
+
+
+def bench_engine_game(scripts: list[Script]) -> float:
+    """Time whole games with GameEngine."""
+    engine = GameEngine()
+
+    def run() -> int:
+        for _ in range(ROUNDS):
+            for word, script in scripts:
+                engine.start(word)
+                for guess in script:
+                    engine.guess(guess)
+        return ROUNDS * len(scripts)
+
+    return best_ns(run)
+
+
+class ScriptedUI(UI):
+    """User interface that plays guesses from a script."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Guesses still to play, last first.
+        self.script: list[str] = []
+
+    def get_guess(self) -> str:
+        """Return the next guess of the script."""
+        return self.script.pop()
+
+
+def bench_full_game(scripts: list[Script]) -> float:
+    """Time whole games with Hangman.play_game."""
+    terminal = io.StringIO()
+    with contextlib.redirect_stdout(terminal):
+        game = Hangman(ScriptedUI, Pacer(math.inf))
+    game.ui.screen = Screen(terminal, ansi=True)
+    ui: ScriptedUI = game.ui  # type: ignore[assignment]
+
+    def run() -> int:
+        with contextlib.redirect_stdout(terminal):
+            for word, script in scripts:
+                ui.script = list(reversed(script))
+                game.initialise_game(word)
+                game.play_game()
+                terminal.seek(0)
+                terminal.truncate()
+        return len(scripts)
+
+    return best_ns(run)
+
+
+def run_benchmarks(only: list[str] | None) -> dict[str, float]:
+    """Return ns per operation of each benchmark."""
+    scripts = scripted_games(GAMES)
+    benchmarks: dict[str, Callable[[], float]] = {
+        'import_lexicon_cold': lambda: bench_import(cold=True),
+        'import_lexicon_warm': lambda: bench_import(cold=False),
+        'get_secret_word': bench_get_secret_word,
+        'update_state_on_guess': lambda: bench_update_state(scripts),
+        'update_puzzle': lambda: bench_update_puzzle(scripts),
+        'update_screen': lambda: bench_update_screen(scripts),
+        'engine_game': lambda: bench_engine_game(scripts),
+        'full_game': lambda: bench_full_game(scripts),
+    }
+    unknown = set(only or ()) - benchmarks.keys()
+    if unknown:
+        sys.exit(f"Unknown benchmark: {', '.join(sorted(unknown))}. "
+                 f"Choose from: {', '.join(benchmarks)}.")
+    results = {}
+    for name, bench in benchmarks.items():
+        if not only or name in only:
+            results[name] = bench()
+            print(f"{name:<24}{format_ns(results[name]):>12}", flush=True)
+    return results
+
+
+def format_ns(value: float) -> str:
+    """Return value, in nanoseconds, with a readable unit."""
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} µs"
+    return f"{value:.0f} ns"
+
+
+def compare(results: dict[str, float], baseline: dict[str, float],
+            threshold: float | None) -> list[str]:
+    """Print results against baseline and return names of regressions."""
+    print(f"\n{'':<24}{'baseline':>12}{'now':>12}{'change':>10}")
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        change = value / old - 1 if old > 0 else 0.0
+        limit = threshold if threshold is not None else THRESHOLDS.get(
+            name, DEFAULT_THRESHOLD)
+        slower = change > limit
+        if slower:
+            regressions.append(name)
+        print(f"{name:<24}{format_ns(old):>12}{format_ns(value):>12}"
+              f"{change:>+10.1%}{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Hangman-CLI and compare with a baseline.")
+    parser.add_argument('--baseline', type=Path, default=BASELINE,
+                        metavar='FILE', help="baseline results, default: "
+                                             f"{BASELINE.name}")
+    parser.add_argument('--save', action='store_true',
+                        help="save the results as the new baseline")
+    parser.add_argument('--output', type=Path, metavar='FILE',
+                        help="also save the results to FILE")
+    parser.add_argument('--threshold', type=float, metavar='PCT',
+                        help="percentage slowdown reported as a regression "
+                             "for every benchmark, default: "
+                             f"{DEFAULT_THRESHOLD:.0%}, or "
+                             f"{max(THRESHOLDS.values()):.0%} for imports")
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help="only run these benchmarks")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks and compare with the baseline."""
+    args = parse_args()
+    results = run_benchmarks(args.only)
+    report = {'python': platform.python_version(),
+              'machine': platform.machine(),
+              'ns_per_op': results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n',
+                               encoding='utf-8')
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline.get('python') != report['python']:
+            print(f"\nBaseline is from Python {baseline.get('python')}, "
+                  f"this is Python {report['python']}.")
+        threshold = None if args.threshold is None else args.threshold / 100
+        regressions = compare(results, baseline['ns_per_op'], threshold)
+    if args.save:
+        saved = {}
+        if args.baseline.exists() and args.only:
+            saved = json.loads(
+                args.baseline.read_text(encoding='utf-8'))['ns_per_op']
+        report['ns_per_op'] = saved | results
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n',
+                                 encoding='utf-8')
+        print(f"\nSaved baseline to {args.baseline}")
+    elif regressions:
+        sys.exit(f"\n{len(regressions)} benchmark(s) slower than baseline: "
+                 f"{', '.join(regressions)}")
+
+
+if __name__ == '__main__':
+    main()
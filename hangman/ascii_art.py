@@ -1,10 +1,20 @@
-"""ASCII art images for Hangman-CLI game."""
+"""ASCII art images for Hangman-CLI game.
 
+The drawings are held in a FrameSet, which prepares every frame once as
+ready-to-write strings. Frames may also be loaded from a text file, in
+which each frame is separated from the next by a line containing only
+FRAME_SEPARATOR.
+"""
 
-def ascii_images() -> tuple[str, ...]:
-    """Return a tuple of hangman (ascii) drawings."""
-    return (
-        r"""
+from collections.abc import Sequence
+from functools import cache
+from pathlib import Path
+
+FRAME_SEPARATOR = '%%'
+
+
+_ASCII_IMAGES = (
+    r"""
 
 
 
@@ -13,7 +23,7 @@ def ascii_images() -> tuple[str, ...]:
 
 =====""",
 
-        r"""
+    r"""
     +
     |
     |
@@ -22,7 +32,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
     |
     |
@@ -31,7 +41,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
     |
@@ -40,7 +50,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -49,7 +59,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -58,7 +68,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -67,7 +77,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -76,7 +86,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -85,7 +95,7 @@ def ascii_images() -> tuple[str, ...]:
     |
 =====""",
 
-        r"""
+    r"""
  +--+
  |  |
  O  |
@@ -93,4 +103,112 @@ def ascii_images() -> tuple[str, ...]:
 / \ |
     |
 ====="""
-    )
+)
+
+
+def ascii_images() -> tuple[str, ...]:
+    """Return a tuple of hangman (ascii) drawings."""
+    return _ASCII_IMAGES
+
+
+class FrameSet:
+    """Hangman drawings prepared as ready-to-write strings.
+
+    Frame 0 is shown before any wrong guesses, and the final frame when
+    the game is lost, so the number of lives is one less than the number
+    of frames.
+    """
+
+    def __init__(self, images: Sequence[str], indent: str = '') -> None:
+        """Initialise FrameSet.
+
+        Parameters
+        ----------
+        images: Sequence[str]
+            The drawings, in order.
+        indent: str
+            Prefix for every line of every frame.
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than two images.
+        """
+        if len(images) < 2:
+            raise ValueError("A frame set needs at least two frames.")
+        self._images = tuple(images)
+        self._indent = indent
+        self._lines = tuple(
+            tuple(indent + line for line in image.split('\n'))
+            for image in self._images)
+        self._text = tuple('\n'.join(lines) for lines in self._lines)
+
+    def __len__(self) -> int:
+        """Return the number of frames."""
+        return len(self._images)
+
+    @property
+    def lives(self) -> int:
+        """Number of wrong guesses before the game is lost."""
+        return len(self._images) - 1
+
+    def lines(self, idx: int) -> tuple[str, ...]:
+        """Return the indented lines of frame idx."""
+        return self._lines[idx]
+
+    def text(self, idx: int) -> str:
+        """Return frame idx as a single indented string."""
+        return self._text[idx]
+
+    def indented(self, indent: str) -> 'FrameSet':
+        """Return a copy of this frame set with each line indented."""
+        return FrameSet(self._images, indent)
+
+    def with_lives(self, lives: int) -> 'FrameSet':
+        """Return a frame set for lives wrong guesses.
+
+        The first and final frames are always kept. With fewer lives,
+        frames in between are skipped, and with more lives, frames are
+        repeated.
+
+        Raises
+        ------
+        ValueError
+            If lives is less than 1.
+        """
+        if lives < 1:
+            raise ValueError("The number of lives must be at least 1.")
+        last = self.lives
+        images = [self._images[round(idx * last / lives)]
+                  for idx in range(lives + 1)]
+        return FrameSet(images, self._indent)
+
+
+def load_frames(path: Path) -> FrameSet:
+    """Return a FrameSet of the drawings in a frame file.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be read, or has fewer than two frames.
+    """
+    try:
+        text = path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Unable to read frames from {path}.") from exc
+    images: list[list[str]] = [[]]
+    for line in text.rstrip('\n').split('\n'):
+        if line.rstrip() == FRAME_SEPARATOR:
+            images.append([])
+        else:
+            images[-1].append(line.rstrip())
+    try:
+        return FrameSet(['\n'.join(lines) for lines in images])
+    except ValueError as exc:
+        raise ValueError(f"{path} has fewer than two frames.") from exc
+
+
+@cache
+def default_frames() -> FrameSet:
+    """Return the built-in drawings as a FrameSet."""
+    return FrameSet(_ASCII_IMAGES)
@@ -0,0 +1,176 @@
+"""Word difficulty scores for Hangman-CLI game.
+
+The difficulty of a word is the number of wrong guesses that the
+FrequencySolver makes before it finds the word. Scores for a whole
+category are computed in batches on a process pool, and cached on disk
+keyed on the contents of the word list, so they are only recomputed when
+the word list changes.
+
+Each category can then be split into 'easy', 'medium' and 'hard' tiers,
+each holding roughly a third of the words.
+"""
+
+import hashlib
+from array import array
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import Any
+
+from filecache import load_cached
+from lexicon import lexicon_dict
+from patterns import UNKNOWN, PatternIndex
+from solver import FrequencySolver
+from wordsource import WordStore
+
+TIERS = ('easy', 'medium', 'hard')
+
+# Increment when the way that words are scored changes.
+_SCORE_VERSION = 1
+
+# Words scored in each batch.
+_BATCH_SIZE = 2000
+
+# Stop counting wrong guesses after this many.
+MAX_SCORE = 26
+
+
+def count_wrong_guesses(solver: FrequencySolver, word: str) -> int:
+    """Return number of wrong guesses solver makes before finding word."""
+    pattern = [UNKNOWN] * len(word)
+    guesses: set[str] = set()
+    wrong = 0
+    while UNKNOWN in pattern and wrong < MAX_SCORE:
+        guess = solver.next_guess(''.join(pattern), guesses)
+        guesses.add(guess)
+        if guess == word:
+            break
+        if len(guess) == 1 and guess in word:
+            pattern = [char if char == guess else old
+                       for char, old in zip(word, pattern)]
+        else:
+            wrong += 1
+    return wrong
+
+
+# Loaders of the full word lists of categories restricted to a tier.
+_full_loaders: dict[str, Callable[[], Sequence[str]]] = {}
+
+
+@cache
+def _full_words(category: str) -> Sequence[str]:
+    """Return every word of category, whatever its difficulty tier."""
+    loader = _full_loaders.get(category)
+    return loader() if loader else lexicon_dict[category].word_list
+
+
+@cache
+def _full_pattern_index(category: str) -> PatternIndex:
+    """Return (cached) pattern index of every word of category."""
+    return PatternIndex(_full_words(category))
+
+
+def score_batch(category: str, start: int, stop: int) -> array:
+    """Return scores of words[start:stop] of category."""
+    words = _full_words(category)
+    solver = FrequencySolver(_full_pattern_index(category))
+    return array('B', (count_wrong_guesses(solver, words[idx])
+                       for idx in range(start, stop)))
+
+
+def _digest(words: Sequence[str]) -> str:
+    """Return digest of the contents of a word list."""
+    hasher = hashlib.sha1(usedforsecurity=False)
+    for word in words:
+        hasher.update(word.encode())
+        hasher.update(b'\n')
+    return hasher.hexdigest()[:16]
+
+
+def score_category(category: str,
+                   initializer: Callable[..., Any] | None = None,
+                   initargs: tuple = ()) -> array:
+    """Return (cached) difficulty score of each word in category.
+
+    Scores are in the same order as the category's full word list.
+
+    Parameters
+    ----------
+    category: str
+        The category to score.
+    initializer: Callable | None
+        Called with initargs in each worker process, for example to add
+        categories given on the command line.
+    initargs: tuple
+        Arguments for initializer.
+    """
+    words = _full_words(category)
+
+    def build() -> array:
+        bounds = range(0, len(words), _BATCH_SIZE)
+        if len(bounds) <= 1:
+            return score_batch(category, 0, len(words))
+        scores = array('B')
+        with ProcessPoolExecutor(initializer=initializer,
+                                 initargs=initargs) as executor:
+            for batch in executor.map(
+                    score_batch, [category] * len(bounds), bounds,
+                    [min(start + _BATCH_SIZE, len(words))
+                     for start in bounds]):
+                scores.extend(batch)
+        return scores
+
+    return load_cached(f'difficulty-{_digest(words)}', (), _SCORE_VERSION,
+                       build)
+
+
+def tier_words(category: str, tier: str,
+               initializer: Callable[..., Any] | None = None,
+               initargs: tuple = ()) -> WordStore:
+    """Return the words of category in a difficulty tier.
+
+    Words are ranked by score (words with equal scores keep their order
+    in the word list), and each tier is a third of the ranking, so no
+    tier is empty if there are at least three words. With fewer, every
+    tier holds all of the words.
+    """
+    words = _full_words(category)
+    scores = score_category(category, initializer, initargs)
+    ranked = sorted(range(len(scores)), key=scores.__getitem__)
+    idx = TIERS.index(tier)
+    in_tier = sorted(ranked[idx * len(ranked) // len(TIERS):
+                            (idx + 1) * len(ranked) // len(TIERS)])
+    if not in_tier:
+        return WordStore(words)
+    return WordStore(words[word_idx] for word_idx in in_tier)
+
+
+def use_difficulty_tier(tier: str,
+                        initializer: Callable[..., Any] | None = None,
+                        initargs: tuple = ()) -> None:
+    """Restrict every category in lexicon_dict to a difficulty tier.
+
+    Words are scored the first time each category is used. Calling
+    this again, for example in a forked worker process, keeps each
+    category's full word list rather than restricting a tier again.
+
+    Raises
+    ------
+    ValueError
+        If tier is not one of TIERS.
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Unknown difficulty '{tier}'.")
+    for category in list(lexicon_dict):
+        _full_loaders.setdefault(category, lexicon_dict.loader(category))
+        lexicon_dict.register(
+            category,
+            _tier_loader(category, tier, initializer, initargs),
+            lexicon_dict.singular(category))
+
+
+def _tier_loader(category: str, tier: str,
+                 initializer: Callable[..., Any] | None,
+                 initargs: tuple) -> Callable[[], Sequence[str]]:
+    """Return loader for the words of category in tier."""
+    return lambda: tier_words(category, tier, initializer, initargs)
@@ -0,0 +1,272 @@
+"""I/O-free game engine for Hangman-CLI game.
+
+GameEngine applies the rules of Hangman to a GameState. It does no I/O
+and never exits the program, so it can be driven in tight loops by the
+simulator, or embedded in a front end such as the terminal UI or the
+network server.
+
+Listeners added to GameEngine.listeners are called with a GameRecord
+when each game ends, for example to save the result.
+
+Example:
+    engine = GameEngine(lives=9)
+    engine.start('HANGMAN')
+    result = engine.guess('a')   # result.outcome is Outcome.CORRECT
+    engine.status().pattern      # '_A___A_'
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from time import perf_counter_ns, time
+
+from gamestate import GameState
+from metrics import METRICS
+
+DEFAULT_LIVES = 9
+
+
+class Outcome(Enum):
+    """How a guess was handled."""
+    CORRECT = 'correct'
+    WRONG = 'wrong'
+    REPEATED = 'repeated'
+    INVALID = 'invalid'
+
+
+# Enum member lookups are slow enough to show in guess() latency.
+_CORRECT = Outcome.CORRECT
+_WRONG = Outcome.WRONG
+
+_GUESS_TIME = METRICS.histogram('engine.guess')
+_WINS = METRICS.counter('games.won')
+_LOSSES = METRICS.counter('games.lost')
+
+
+@dataclass(slots=True)
+class GuessResult:
+    """Result of GameEngine.guess().
+
+    Attributes
+    ----------
+    guess : str
+        The normalised (upper case) guess.
+    outcome : Outcome
+        CORRECT or WRONG if the guess was played. REPEATED and INVALID
+        guesses do not change the game.
+    lives_left : int
+        Wrong guesses remaining.
+    is_over : bool
+        True if the game has been won or lost.
+    """
+    guess: str
+    outcome: Outcome
+    lives_left: int
+    is_over: bool
+
+
+@dataclass(slots=True)
+class GameStatus:
+    """Snapshot from GameEngine.status().
+
+    Attributes
+    ----------
+    pattern : str
+        The puzzle, with UNKNOWN for each unrevealed letter.
+    guesses : frozenset[str]
+        Every guess played in this game.
+    lives_left : int
+        Wrong guesses remaining.
+    is_solved : bool
+        True if the game has been won.
+    is_lost : bool
+        True if the game has been lost.
+    wins : int
+        Games won with this engine.
+    losses : int
+        Games lost with this engine.
+    """
+    # pylint: disable=too-many-instance-attributes
+    pattern: str
+    guesses: frozenset[str]
+    lives_left: int
+    is_solved: bool
+    is_lost: bool
+    wins: int
+    losses: int
+
+
+@dataclass(slots=True)
+class GameRecord:
+    """A finished game, passed to GameEngine.listeners.
+
+    Attributes
+    ----------
+    time : float
+        When the game ended, in seconds since the epoch.
+    player : str
+        The player's name.
+    category : str
+        Category of the word.
+    word : str
+        The secret word.
+    guesses : tuple[str, ...]
+        Guesses played, in order.
+    won : bool
+        True if the player won.
+    started : float
+        When the game started, in seconds since the epoch.
+    lives : int
+        Number of wrong guesses that lost the game.
+    guess_times : tuple[float, ...]
+        When each guess was played, in seconds after started.
+    """
+    # pylint: disable=too-many-instance-attributes
+    time: float
+    player: str
+    category: str
+    word: str
+    guesses: tuple[str, ...] = field(default=())
+    won: bool = False
+    started: float = 0.0
+    lives: int = 0
+    guess_times: tuple[float, ...] = field(default=())
+
+
+class GameError(Exception):
+    """A guess was made when no game is in progress."""
+
+
+class GameEngine:
+    """Rules of Hangman.
+
+    Attributes
+    ----------
+    state : GameState
+        State of the current game, also read by user interfaces.
+    lives : int
+        Number of wrong guesses that loses a game.
+    wins : int
+        Games won.
+    losses : int
+        Games lost.
+    listeners : list[Callable[[GameRecord], None]]
+        Functions called with a GameRecord when a game ends.
+    """
+
+    def __init__(self, lives: int = DEFAULT_LIVES,
+                 state: GameState | None = None) -> None:
+        """Initialise GameEngine.
+
+        Parameters
+        ----------
+        lives: int
+            Number of wrong guesses that loses a game.
+        state: GameState | None
+            Game state to update, default: a new GameState.
+        """
+        self.state = state or GameState()
+        self.lives = lives
+        self.wins = 0
+        self.losses = 0
+        self.listeners: list[Callable[[GameRecord], None]] = []
+        # (guess, time) of each guess played in the current game.
+        self._history: list[tuple[str, float]] = []
+        self._started = 0.0
+
+    @property
+    def lives_left(self) -> int:
+        """Wrong guesses remaining in the current game."""
+        return self.lives - self.state.image_idx
+
+    @property
+    def is_lost(self) -> bool:
+        """True if the current game has been lost."""
+        return self.state.image_idx >= self.lives
+
+    @property
+    def is_over(self) -> bool:
+        """True if there is no game in progress."""
+        return not self.state.word or self.state.is_solved or self.is_lost
+
+    def start(self, word: str) -> GameStatus:
+        """Start a new game of word and return its status."""
+        state = self.state
+        state.reset_current_game()
+        state.word = word.upper()
+        state.initialise_game_state()
+        state.score = {'wins': self.wins, 'losses': self.losses}
+        self._history = []
+        self._started = time()
+        return self.status()
+
+    def guess(self, guess: str) -> GuessResult:
+        """Play guess, a letter or the whole word.
+
+        Guesses are not case sensitive. A guess that has already been
+        played, or that is neither one letter nor the length of the word,
+        is reported and otherwise ignored.
+
+        Raises
+        ------
+        GameError
+            If there is no game in progress.
+        """
+        if METRICS.enabled:
+            start = perf_counter_ns()
+            result = self._play(guess)
+            _GUESS_TIME.observe(perf_counter_ns() - start)
+            return result
+        return self._play(guess)
+
+    def _play(self, guess: str) -> GuessResult:
+        """Play guess. See guess()."""
+        state = self.state
+        lives_left = self.lives - state.image_idx
+        if not state.word or state.is_solved or lives_left <= 0:
+            raise GameError("No game in progress.")
+        guess = guess.strip().upper()
+        if guess in state.guesses:
+            return GuessResult(guess, Outcome.REPEATED, lives_left, False)
+        if not guess.isalpha() or len(guess) not in (1, len(state.word)):
+            return GuessResult(guess, Outcome.INVALID, lives_left, False)
+        state.current_guess = guess
+        state.guesses.add(guess)
+        self._history.append((guess, time()))
+        state.update_state_on_guess()
+        if state.good_guess:
+            if state.is_solved:
+                self.wins += 1
+                state.score['wins'] = self.wins
+                self._game_over(True)
+                return GuessResult(guess, _CORRECT, lives_left, True)
+            return GuessResult(guess, _CORRECT, lives_left, False)
+        lives_left -= 1
+        if lives_left > 0:
+            return GuessResult(guess, _WRONG, lives_left, False)
+        self.losses += 1
+        state.score['losses'] = self.losses
+        self._game_over(False)
+        return GuessResult(guess, _WRONG, lives_left, True)
+
+    def _game_over(self, won: bool) -> None:
+        """Tell listeners that the game has ended."""
+        if METRICS.enabled:
+            (_WINS if won else _LOSSES).inc()
+        if not self.listeners:
+            return
+        state = self.state
+        started = self._started
+        record = GameRecord(
+            time(), state.player_name, state.category, state.word,
+            tuple(guess for guess, _ in self._history), won, started,
+            self.lives, tuple(when - started for _, when in self._history))
+        for listener in self.listeners:
+            listener(record)
+
+    def status(self) -> GameStatus:
+        """Return a snapshot of the current game."""
+        state = self.state
+        return GameStatus(state.pattern, frozenset(state.guesses),
+                          self.lives_left, state.is_solved, self.is_lost,
+                          self.wins, self.losses)
@@ -0,0 +1,170 @@
+"""Adversarial "evil hangman" rules for Hangman-CLI game.
+
+EvilEngine does not commit to a secret word. It keeps every word of the
+right length in the category as a candidate, and after each letter
+guessed it splits the candidates into families that would show the same
+puzzle, and keeps the largest family. A wrong guess is one that the
+largest family does not contain.
+
+Candidates are a bitset over a LengthGroup of the category's
+PatternIndex, so the families of a guess are found with a few bitset
+operations per position of the word, not by looking at each word:
+
+- Words without the letter are candidates & ~contains[letter].
+- Words with it are split, one position at a time, into those with the
+  letter at that position and those without.
+
+The set of candidates only ever shrinks, so each guess works on a
+smaller bitset than the one before.
+
+GameState.word always holds one of the candidates, so the puzzle is
+drawn, and the game is won or lost, exactly as in the standard game.
+"""
+
+from random import Random
+from time import perf_counter_ns
+
+from engine import DEFAULT_LIVES, GameEngine, GameStatus, GuessResult
+from gamestate import GameState, secret_words
+from lexicon import get_pattern_index
+from metrics import METRICS
+from patterns import LengthGroup, nth_bit
+
+_PARTITION_TIME = METRICS.histogram('evil.partition')
+
+_NO_WORDS = LengthGroup([])
+
+
+def families(group: LengthGroup, candidates: int,
+             letter: str) -> dict[int, int]:
+    """Split candidates by where they have letter.
+
+    Parameters
+    ----------
+    group: LengthGroup
+        The words that candidates is a bitset of.
+    candidates: int
+        Bitset of the words to split.
+    letter: str
+        The letter guessed.
+
+    Returns
+    -------
+    dict[int, int]
+        For each bitmask of positions of letter (0 for words without
+        it), the bitset of candidates with letter at exactly those
+        positions. Empty families are left out.
+    """
+    with_letter = candidates & group.contains.get(letter, 0)
+    without = candidates & ~with_letter
+    result = {0: without} if without else {}
+    parts = [(0, with_letter)] if with_letter else []
+    for pos, position in enumerate(group.at_position):
+        here = position.get(letter, 0)
+        if not here:
+            continue
+        split = []
+        for key, bits in parts:
+            hit = bits & here
+            if hit:
+                split.append((key | 1 << pos, hit))
+                bits &= ~here
+            if bits:
+                split.append((key, bits))
+        parts = split
+    result.update(parts)
+    return result
+
+
+class EvilEngine(GameEngine):
+    """GameEngine that puts off choosing the word for as long as it can.
+
+    The word given to start() only sets the length of the word. If the
+    category of the game has no words of that length, the game is played
+    with the given word, as by GameEngine.
+    """
+
+    def __init__(self, lives: int = DEFAULT_LIVES,
+                 state: GameState | None = None,
+                 rng: Random | None = None) -> None:
+        """Initialise EvilEngine.
+
+        Parameters
+        ----------
+        lives: int
+            Number of wrong guesses that loses a game.
+        state: GameState | None
+            Game state to update, default: a new GameState.
+        rng: Random | None
+            Chooses which candidate is shown as the word, and so which
+            word is revealed at the end, default: a new Random seeded
+            with secret_words.seed.
+        """
+        super().__init__(lives, state)
+        self._rng = rng or Random(secret_words.seed)
+        self._group = _NO_WORDS
+        # Bitset of the words that fit every guess so far.
+        self._candidates = 0
+        # Index in the group of the candidate held in state.word.
+        self._word_idx = 0
+
+    @property
+    def candidates(self) -> int:
+        """Number of words that fit every guess so far."""
+        return self._candidates.bit_count()
+
+    def start(self, word: str) -> GameStatus:
+        """Start a new game with a word of the same length as word."""
+        status = super().start(word)
+        category = self.state.category
+        self._group = _NO_WORDS
+        if category:
+            self._group = (get_pattern_index(category).group(
+                len(self.state.word)) or _NO_WORDS)
+        self._candidates = self._group.all_words
+        if self._candidates:
+            self._choose_word()
+        return status
+
+    def _play(self, guess: str) -> GuessResult:
+        """Narrow the candidates, then play guess. See guess()."""
+        state = self.state
+        guess = guess.strip().upper()
+        if (self._candidates and guess not in state.guesses
+                and not self.is_over and guess.isalpha()):
+            if len(guess) == 1:
+                self._dodge_letter(guess)
+            elif len(guess) == len(state.word):
+                self._dodge_word(guess)
+        return super()._play(guess)
+
+    def _dodge_letter(self, letter: str) -> None:
+        """Keep the largest family of candidates for letter."""
+        start = perf_counter_ns() if METRICS.enabled else 0
+        split = families(self._group, self._candidates, letter)
+        # Most words, then not revealing the letter, then fewest revealed.
+        key = max(split, key=lambda key: (split[key].bit_count(), not key,
+                                          -key.bit_count()))
+        self._candidates = split[key]
+        if not self._candidates >> self._word_idx & 1:
+            self._choose_word()
+        if start:
+            _PARTITION_TIME.observe(perf_counter_ns() - start)
+
+    def _dodge_word(self, guess: str) -> None:
+        """Drop guess from the candidates, unless it is the only one."""
+        try:
+            idx = self._group.words.index(guess)
+        except ValueError:
+            return
+        others = self._candidates & ~(1 << idx)
+        if others:
+            self._candidates = others
+            if idx == self._word_idx:
+                self._choose_word()
+
+    def _choose_word(self) -> None:
+        """Show a random candidate as the word."""
+        self._word_idx = nth_bit(self._candidates,
+                                 self._rng.randrange(self.candidates))
+        self.state.substitute_word(self._group.words[self._word_idx])
@@ -0,0 +1,87 @@
+"""On-disk cache for data built from files, for Hangman-CLI game.
+
+Data that is slow to build from a file, such as a word list index, is
+pickled to the cache directory after a key made from the path, size and
+modification time of each source file. The key is pickled on its own and
+checked before the data is unpickled, and when it still matches, the data
+is loaded from the cache in a single read.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+def cache_dir() -> Path:
+    """Return the directory used for cached word lists.
+
+    HANGMAN_CACHE_DIR overrides the default of $XDG_CACHE_HOME/hangman-cli.
+    """
+    if 'HANGMAN_CACHE_DIR' in os.environ:
+        return Path(os.environ['HANGMAN_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'hangman-cli'
+
+
+def _source_key(source: Path) -> tuple[str, int, int]:
+    """Return (path, size, mtime) identifying the version of source."""
+    stat = source.stat()
+    return str(source.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def load_cached(name: str, sources: Iterable[Path], version: int,
+                build: Callable[[], T]) -> T:
+    """Return data built from sources, using the on-disk cache if fresh.
+
+    The cache file is read in one bulk read. If it is missing, unreadable,
+    or any source file has changed since it was written, build() is called
+    and the result is written back to the cache. Data that cannot be
+    unpickled, for example because it refers to a class that has since
+    changed, is rebuilt in the same way. Failing to write the cache is not
+    an error.
+
+    Parameters
+    ----------
+    name: str
+        Name of the cache file (without extension).
+    sources: Iterable[Path]
+        Files that the data is built from.
+    version: int
+        Format version of the data. Cached data with a different
+        version is rebuilt.
+    build: Callable[[], T]
+        Function that builds the data from the sources.
+    """
+    key = (version, tuple(_source_key(src) for src in sources))
+    cache_file = cache_dir() / f'{name}.cache'
+    try:
+        stream = io.BytesIO(cache_file.read_bytes())
+        if pickle.load(stream) == key:
+            return pickle.load(stream)
+    # Unpickling stale data can raise almost anything.
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass
+    data = build()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_file.write_bytes(
+            pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+            + pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    return data
+
+
+def cache_name(prefix: str, source: Path) -> str:
+    """Return a cache file name unique to source file."""
+    digest = hashlib.sha1(str(source.resolve()).encode(),
+                          usedforsecurity=False).hexdigest()
+    return f'{prefix}-{digest[:16]}'
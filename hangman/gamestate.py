@@ -0,0 +1,222 @@
+"""Game state for Hangman-CLI game.
+
+GameState holds everything about one player's games, without any I/O,
+so that it can be shared by the terminal game, the simulator and the
+network server.
+
+Secret words are drawn from a ShuffleBag for each category, so no word
+is repeated until every word in its category has been played.
+"""
+
+from collections import namedtuple
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from random import Random
+from time import perf_counter_ns
+
+from lexicon import lexicon_dict
+from metrics import METRICS
+from patterns import UNKNOWN, wrong_letters
+from wordsource import ShuffleBag
+
+PuzzleLetter = namedtuple('PuzzleLetter', ['character', 'guessed'])
+"""Type definition for a namedtuple('character', 'guessed').
+
+character: str
+    One of the characters from the mystery word.
+guessed: bool
+    True if the letter has been guessed, else False.
+"""
+
+Puzzle = list[PuzzleLetter]
+"""Type definition for a list of PuzzleLetter(s)."""
+
+_SECRET_WORD_TIME = METRICS.histogram('get_secret_word')
+
+
+class SecretWords:
+    """A ShuffleBag of secret words for each category.
+
+    Attributes
+    ----------
+    seed : int | None
+        Random seed. With a seed, each category gives the same words in
+        the same order every time, whatever other categories are played.
+        None seeds from the operating system.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.seed = seed
+        self._bags: dict[str, ShuffleBag] = {}
+
+    def reseed(self, seed: int | None) -> None:
+        """Start every category again, from seed."""
+        self.seed = seed
+        self._bags.clear()
+
+    def draw(self, category: str, words: Sequence[str]) -> str:
+        """Return the next word of category, whose word list is words."""
+        bag = self._bags.get(category)
+        if bag is None or bag.words is not words:
+            # New category, or its word list has been replaced.
+            rng = Random(None if self.seed is None
+                         else f'{self.seed}:{category}')
+            bag = self._bags[category] = ShuffleBag(words, rng)
+        return bag.draw()
+
+
+secret_words = SecretWords()
+"""Secret words of this process."""
+
+
+def get_secret_word(category: str) -> str:
+    """Return a random word that has not been played recently.
+
+    Words are not repeated until every word of the category has been
+    returned.
+    """
+    start = perf_counter_ns() if METRICS.enabled else 0
+    try:
+        words: Sequence[str] = lexicon_dict[category].word_list
+    except ValueError as exc:
+        raise RuntimeError("Unable to retrieve word list.") from exc
+    if not words:
+        raise RuntimeError("Word list is empty.")
+    secret_word = secret_words.draw(category, words)
+    if isinstance(secret_word, str) and len(secret_word) > 0:
+        if start:
+            _SECRET_WORD_TIME.observe(perf_counter_ns() - start)
+        return secret_word
+    raise RuntimeError("Unable to return secret word.")
+
+
+@dataclass(slots=True)
+class GameState:
+    """Manage state for the game.
+
+    The puzzle is held as a bitmask of revealed positions in the word,
+    with a map from each letter of the word to the bitmask of its
+    positions, so that a guess updates the state without rebuilding
+    the puzzle.
+
+    Attributes
+    ----------
+    player_name : str
+        The player's name.
+    score : dict[str, int]
+        Game wins and losses.
+    word : str
+        The mystery word.
+    current_guess : str
+        The current guess.
+    guesses : set
+        The set of all guesses tried in this game.
+    image_idx : int
+        Index of the image to display.
+    good_guess : bool
+        True if the current guess was correct.
+    """
+    # pylint: disable=too-many-instance-attributes
+    player_name: str = ''
+    score: dict[str, int] = field(default_factory=dict)
+    category: str = ''
+    word: str = ''
+    current_guess: str = ''
+    guesses: set[str] = field(default_factory=set)
+    image_idx: int = 0
+    good_guess: bool = False
+    _positions: dict[str, int] = field(default_factory=dict, repr=False)
+    _revealed: int = field(default=0, repr=False)
+    _all_revealed: int = field(default=0, repr=False)
+
+    def initialise_game_state(self) -> None:
+        """Post-instantiation initialisation.
+
+        Complete the initialisation of GameState after
+        puzzle_word has been set.
+        """
+        self._positions = {}
+        for idx, char in enumerate(self.word):
+            self._positions[char] = self._positions.get(char, 0) | 1 << idx
+        self._revealed = 0
+        self._all_revealed = (1 << len(self.word)) - 1
+
+    def substitute_word(self, word: str) -> None:
+        """Replace the word, keeping the revealed positions.
+
+        word must fit the puzzle: the same length, the same letters at
+        the revealed positions, and none of those letters elsewhere.
+        """
+        revealed = self._revealed
+        self.word = word
+        self.initialise_game_state()
+        self._revealed = revealed
+
+    @property
+    def is_solved(self) -> bool:
+        """True when every letter of the word has been revealed."""
+        return self._revealed == self._all_revealed
+
+    @property
+    def remaining_letters(self) -> set[str]:
+        """The set of letters still required."""
+        return {char for char, positions in self._positions.items()
+                if not self._revealed & positions}
+
+    @property
+    def puzzle(self) -> Puzzle:
+        """Puzzle list, built from the revealed positions."""
+        return [PuzzleLetter(char, bool(self._revealed >> idx & 1))
+                for idx, char in enumerate(self.word)]
+
+    @property
+    def pattern(self) -> str:
+        """Puzzle as a string, with UNKNOWN for each unrevealed letter."""
+        return ''.join(char if self._revealed >> idx & 1 else UNKNOWN
+                       for idx, char in enumerate(self.word))
+
+    @property
+    def wrong_letters(self) -> set[str]:
+        """The letters guessed that are not in the word."""
+        return wrong_letters(self.pattern, self.guesses)
+
+    def update_state_on_guess(self) -> None:
+        """Update the game state based on the current guess.
+
+        A correct guess reveals its positions in the puzzle. If the
+        guess is wrong (a letter not in the word, or the wrong word),
+        increment the image index.
+        """
+        if len(self.current_guess) > 1:  # Word guess
+            self.good_guess = self.current_guess == self.word
+        else:
+            self.good_guess = self.current_guess in self._positions
+        if self.good_guess:
+            self.update_puzzle()
+        else:
+            self.image_idx += 1
+
+    def update_puzzle(self) -> None:
+        """Reveal the current guess in the puzzle.
+
+        Called by update_state_on_guess to handle updating the puzzle data.
+        """
+        if self.current_guess == self.word:  # Whole word guessed.
+            self._revealed = self._all_revealed
+        else:
+            self._revealed |= self._positions.get(self.current_guess, 0)
+
+    def reset_current_game(self) -> None:
+        """Reset current game settings.
+
+        Does not reset entire session as some game settings,
+        such as _player_name, need to persist across multiple games.
+        """
+        self.word = ''
+        self.current_guess = ''
+        self.guesses = set()
+        self.image_idx = 0
+        self.good_guess = False
+        self._positions = {}
+        self._revealed = 0
+        self._all_revealed = 0
@@ -11,14 +11,71 @@ incorrect guess. The player wins by guessing all letters of the secret word
 correctly within the given attempts.
 
 Usage:
-    python3 hangman.py
+    python3 hangman.py [--length MIN-MAX] [--words FILE] [--word-dir DIR]
+                       [--auto] [--simulate N [--category NAME]
+                       [--strategy {solver,random}]
+                       [--workers N]] [--difficulty LEVEL]
+                       [--score-words] [--speed SPEED]
+                       [--frames FILE] [--lives N] [--speedrun] [--evil]
+                       [--seed SEED]
+                       [--serve PORT [--host HOST]] [--no-journal]
+                       [--leaderboard [CATEGORY] [--top N] [--days N]]
+                       [--record FILE] [--replay FILE [--validate]]
+                       [--metrics] [--metrics-file FILE]
+
+Options:
+    --length MIN-MAX    Add a category of dictionary words with
+                        MIN to MAX letters, e.g. --length 6-9.
+    --words FILE        Add a category of words from FILE, which
+                        has one word per line.
+    --word-dir DIR      Add a category for each .txt, .gz or .xz
+                        word list file in DIR.
+    --auto              Watch the computer play.
+    --simulate N        Play N games without any display, and
+                        report the speed and win rate.
+    --category NAME     Category of words to simulate.
+    --strategy NAME     How simulated games guess: 'solver' or
+                        'random'.
+    --workers N         Number of processes for simulated games.
+    --difficulty LEVEL  Only use 'easy', 'medium' or 'hard' words.
+    --score-words       Score the difficulty of every word in every
+                        category, and report the average score.
+    --speed SPEED       Text speed: 'instant', 'normal', or a number
+                        such as 2 for twice the normal speed.
+    --frames FILE       Load the hangman drawings from FILE, with
+                        frames separated by lines of '%%'.
+    --lives N           Number of wrong guesses allowed, default:
+                        one less than the number of frames.
+    --speedrun          Time each game, with a timer on screen.
+    --evil              Evil mode: the computer changes its word
+                        to dodge each guess.
+    --seed SEED         Random seed for choosing secret words, and
+                        for simulated games.
+    --serve PORT        Host games for network clients on PORT.
+    --host HOST         Address to listen on, default: 127.0.0.1.
+    --no-journal        Do not save finished games.
+    --leaderboard [CATEGORY]
+                        Show the players with the most wins, in all
+                        categories or in CATEGORY.
+    --top N             Number of players on the leaderboard.
+    --days N            Only count games from the last N days.
+    --record FILE       Add the games played to recording FILE.
+    --replay FILE       Show the games in recording FILE, at the
+                        speed set by --speed.
+    --validate          With --replay, check that each recorded
+                        game has the same result under the current
+                        rules, without showing the games.
+    --metrics           Print counters and timings on exit.
+    --metrics-file FILE Append counters and timings to FILE as JSON
+                        lines, every 10 seconds and on exit.
 
 Instructions:
 
 - Enter your name when prompted.
 - You'll be given a limited number of attempts to guess the secret word.
-- Enter a single letter as your guess for each round. Letters may be
-  capital letters or small letters, it makes no difference.
+- Press a letter key to guess that letter. Letters may be capital
+  letters or small letters, it makes no difference. To guess the whole
+  word, press '=', type the word and press Enter.
 - If your guess is correct, the letter will be revealed in the word.
 - If your guess is incorrect, a part of the hangman will be drawn.
 - You win if you guess all letters before the hangman is fully drawn.
@@ -27,143 +84,68 @@ Good luck and have fun playing Hangman!
 
 """
 
-import os
+import argparse
+import asyncio
+import sqlite3
 import sys
-from collections import namedtuple
-from dataclasses import dataclass, field
 from random import randint
-from time import sleep
+from time import monotonic, perf_counter_ns
+
+from ascii_art import FrameSet, default_frames, load_frames
+from engine import GameEngine, Outcome
+from evil import EvilEngine
+from gamestate import GameState, get_secret_word, secret_words
+from journal import Journal
+from recording import (Recorder, RecordedGame, RecordingError,
+                       format_validation, read_games, validate)
+from leaderboard import Leaderboard, format_leaderboard
+from metrics import METRICS
+from options import parse_args
+from lexicon import (add_file_category, add_length_category,
+                     add_word_directory, get_pattern_index, lexicon_dict,
+                     word_file_reports, HELP_TEXT)
+from difficulty import score_category, use_difficulty_tier
+from server import HangmanServer, serve
+from simulate import SimulationConfig, format_report, run_simulation
+from solver import FrequencySolver
+from terminal import KeyReader, Pacer, Screen
+
+_UPDATE_SCREEN_TIME = METRICS.histogram('ui.update_screen')
+
+# Key that starts typing a guess of the whole word.
+WORD_KEY = '='
 
-from ascii_art import ascii_images as art
-from lexicon import lexicon_dict, HELP_TEXT
 
-PuzzleLetter = namedtuple('PuzzleLetter', ['character', 'guessed'])
-"""Type definition for a namedtuple('character', 'guessed').
-
-character: str
-    One of the characters from the mystery word.
-guessed: bool
-    True if the letter has been guessed, else False.
-"""
-
-Puzzle = list[PuzzleLetter]
-"""Type definition for a list of PuzzleLetter(s)."""
-
-
-def get_secret_word(category: str) -> str:
-    """Return a random word from multiple options."""
-    try:
-        words: list[str] = lexicon_dict[category].word_list
-    except ValueError as exc:
-        raise RuntimeError("Unable to retrieve word list.") from exc
-    secret_word = words[randint(0, len(words) - 1)]
-    if isinstance(secret_word, str) and len(secret_word) > 0:
-        return secret_word
-    raise RuntimeError("Unable to return secret word.")
-
-
-@dataclass
-class GameState:
-    """Manage state for the game.
+class UI:
+    """User interface class.
 
-    Attributes
-    ----------
-    player_name : str
-        The player's name.
-    score : dict[str, int]
-        Game wins and losses.
-    word : str
-        The mystery word.
-    current_guess : str
-        The current guess.
-    guesses : set
-        The set of all guesses tried in this game.
-    remaining_letters : set
-        The set of letters still required.
-    puzzle : list
-        Puzzle list.
-    image_idx : int
-        Index of the image to display.
+    In a terminal, guesses and answers are single key presses. Otherwise
+    (for example when input is piped) they are lines of input.
     """
-    # pylint: disable=too-many-instance-attributes
-    player_name: str = ''
-    score: dict[str, int] = field(default_factory=dict)
-    category: str = ''
-    word: str = ''
-    current_guess: str = ''
-    guesses: set[str] = field(default_factory=set)
-    remaining_letters: set[str] = field(default_factory=set)
-    puzzle: Puzzle = field(default_factory=list)
-    image_idx: int = 0
-
-    def initialise_game_state(self) -> None:
-        """Post-instantiation initialisation.
-
-        Complete the initialisation of GameState after
-        puzzle_word has been set.
-        """
-        self.remaining_letters = set(self.word)
-        self.puzzle = [PuzzleLetter(char, False) for char in self.word]
 
-    def update_state_on_guess(self) -> None:
-        """Update the game state based on the current guess.
+    # Seconds between calls to tick() while waiting for a key, or None.
+    tick_interval: float | None = None
 
-        Checks first for a whole word guess.
-        Tries to remove the guessed letter from the remaining_letters set.
-        If the letter is not in the word, increment the image index.
-        """
-        if len(self.current_guess) > 1:  # Word guess
-            if self.current_guess == self.word:  # Correct guess
-                self.remaining_letters.clear()
-                self.update_puzzle()
-            else:
-                self.image_idx += 1  # Wrong word.
-        try:
-            self.remaining_letters.remove(self.current_guess)
-            self.update_puzzle()
-        except KeyError:
-            self.image_idx += 1  # Not in word.
-
-    def update_puzzle(self) -> None:
-        """Return updated puzzle.
-
-        Called by update_game_state to handle updating the puzzle data.
-        Add 'True' to each matching tuple and return result.
-        """
-        if self.current_guess == self.word:  # Whole word guessed.
-            self.puzzle = [PuzzleLetter(char, True) for char, _ in self.puzzle]
-            return
-        self.puzzle = [
-            PuzzleLetter(char, val or (char == self.current_guess))
-            for char, val in self.puzzle]
-
-    def reset_current_game(self) -> None:
-        """Reset current game settings.
-
-        Does not reset entire session as some game settings,
-        such as _player_name, need to persist across multiple games.
-        """
-        self.word = ''
-        self.current_guess = ''
-        self.guesses = set()
-        self.remaining_letters = set()
-        self.puzzle = []
-        self.image_idx = 0
-
-
-class UI:
-    """User interface class."""
-
-    def __init__(self, game_state: GameState) -> None:
+    def __init__(self, game_state: GameState,
+                 pacer: Pacer | None = None,
+                 frames: FrameSet | None = None) -> None:
         """Initialise UI.
 
         Parameters
         ----------
         game_state: GameState
             Game state
+        pacer: Pacer | None
+            Scheduler for delays, default: Pacer at normal speed.
+        frames: FrameSet | None
+            Hangman drawings, default: the built-in drawings.
         """
         self.game_state = game_state
+        self.pacer = pacer or Pacer()
         self._indent = ' ' * 4
+        self.frames = (frames or default_frames()).indented(self._indent)
+        self.screen = Screen()
+        self.keys = KeyReader()
 
     def indent_text(self, text: str):
         """Indent each printed line."""
@@ -190,7 +172,7 @@ class UI:
         str
             The player's name.
         """
-        UI.clear_terminal()
+        self.clear_terminal()
         self.print_slowly("Hi there. What's your name?", end=' ')
         player_name = input().title()
         self.print_slowly(f"Hello {player_name}.", end='\n\n')
@@ -214,7 +196,8 @@ class UI:
         for idx, cat in enumerate(categories):
             self.display_message(f"{idx + 1}. {cat.title()}")
         while True:
-            category = input("Enter a number: ")
+            category = self.read_answer("Enter a number: ",
+                                        single_key=len(categories) < 10)
             if category == '?':
                 self.display_help()
                 return ''
@@ -232,38 +215,91 @@ class UI:
         category = lexicon_dict[self.game_state.category].singular
         self.print_slowly(f"I'll think of {category}", end='')
         self.print_slowly(' .' * randint(3, 8), speed=5, indent=False)
-        UI.clear_terminal()
+        self.clear_terminal()
 
     def display_help(self):
         """Display Help screen."""
         self.clear_terminal()
         self.display_message(HELP_TEXT)
         self.display_message("Press any key to continue:")
-        input()
+        if self.keys.interactive:
+            self.wait_for_key()
+        else:
+            input()
         self.clear_terminal()
 
     def get_guess(self) -> str:
         """Return a new guess.
 
+        In a terminal, a letter is guessed with a single key press, and
+        letters that have already been guessed are ignored. WORD_KEY
+        starts typing the whole word, ended by Enter.
+
         Returns
         -------
         str
             The guess - a single character or a whole word.
         """
+        print("Guess a letter: ", end='', flush=True)
+        if not self.keys.interactive:
+            return input().strip().upper()
         while True:
-            print("Guess a letter: ", end='')
-            new_guess = input().strip().upper()
-
-            if new_guess in self.game_state.guesses:
-                print(f"You've already guessed '{new_guess}'")
-                continue
-            if (len(new_guess) != 1 and
-                    len(new_guess) != len(self.game_state.word)):
-                word_len = len(self.game_state.word)
-                print("Guesses must be one letter or"
-                      f"the whole {word_len} letter word.")
+            key = self.wait_for_key()
+            if key == WORD_KEY:
+                # Replace the prompt, which is the same length.
+                word = input("\rGuess the word: ").strip().upper()
+                if word:
+                    return word
+                print("Guess a letter: ", end='', flush=True)
                 continue
-            return new_guess
+            if key in ('?', '!'):
+                print(key)
+                return key
+            letter = key.upper()
+            if (len(letter) == 1 and letter.isalpha()
+                    and letter not in self.game_state.guesses):
+                print(letter)
+                return letter
+
+    def wait_for_key(self) -> str:
+        """Return the next key pressed, calling tick() while waiting."""
+        with self.keys.cbreak():
+            while True:
+                key = self.keys.read_key(self.tick_interval)
+                if key is not None:
+                    return key
+                self.tick()
+
+    def tick(self) -> None:
+        """Called every tick_interval seconds while waiting for a key."""
+
+    def read_answer(self, prompt: str, single_key: bool = True) -> str:
+        """Print prompt and return the player's answer.
+
+        In a terminal, if single_key is True, the answer is one key
+        press. Otherwise it is a line of input.
+        """
+        if not (single_key and self.keys.interactive):
+            return input(prompt)
+        print(prompt, end='', flush=True)
+        key = self.wait_for_key()
+        print(key if key.isprintable() else '')
+        return key
+
+    def display_hint(self) -> None:
+        """Tell player how many words fit the puzzle, and suggest one."""
+        state = self.game_state
+        pattern = state.pattern
+        wrong_letters = state.wrong_letters
+        index = get_pattern_index(state.category)
+        count = index.count(pattern, wrong_letters)
+        if count == 1:
+            self.display_message("Only one word fits.")
+        else:
+            self.display_message(f"{count} possible words fit.")
+        suggestion = index.suggest(pattern, wrong_letters)
+        if suggestion:
+            self.display_message(f"How about {suggestion}?")
 
     def display_game_start_screen(self) -> None:
         """Inform user of word length."""
@@ -272,8 +308,8 @@ class UI:
         self.print_slowly(
             f"I've thought of {category}.\n"
             f"The word has {len(self.game_state.word)} letters.")
-        sleep(1)
-        UI.clear_terminal()
+        self.pacer.sleep(1)
+        self.clear_terminal()
 
     def display_game_result(self, is_winner: bool) -> None:
         """Congratulate or console player."""
@@ -284,7 +320,7 @@ class UI:
 
         if is_winner:
             self.print_slowly(f"Well done {self.game_state.player_name}.", 20)
-            remaing_guesses = 9 - self.game_state.image_idx
+            remaing_guesses = self.frames.lives - self.game_state.image_idx
             self.print_slowly("You got the word "
                               f"{self.game_state.word.upper()} with "
                               f"{remaing_guesses} guesses remaining.")
@@ -296,8 +332,8 @@ class UI:
             self.print_slowly("Better luck next time.", 6)
 
     def get_image(self) -> str:
-        """Return hangman ascii drawing."""
-        return art()[self.game_state.image_idx]
+        """Return hangman ascii drawing, indented."""
+        return self.frames.text(self.game_state.image_idx)
 
     def prompt_confirm(self, prompt: str) -> bool:
         """Prompt for yes/no answer.
@@ -313,8 +349,7 @@ class UI:
             True if yes, else False.
         """
         while True:
-            self.display_message(prompt, end='')
-            val = input().strip().lower()
+            val = self.read_answer(self.indent_text(prompt)).strip().lower()
             if val == '?':
                 self.display_help()
                 continue
@@ -325,30 +360,36 @@ class UI:
             self.display_message("Enter 'Y' or 'N'.")
 
     def update_screen(self, clear: bool = True) -> None:
-        """Refresh screen with current game state."""
-        if clear:
-            UI.clear_terminal()
-        # Print score
+        """Refresh screen with current game state.
+
+        The frame is written in one go. If clear is False, it is printed
+        below whatever is already on screen.
+        """
+        start = perf_counter_ns() if METRICS.enabled else 0
+        # Score
         wins, losses = self.game_state.score.values()
-        self.display_message(f"Won: {wins}  Lost: {losses}")
-        # Print hangman image.
-        self.display_message(self.get_image())
-        # Print underscores and guessed letters.
+        lines = [f"{self._indent}Won: {wins}  Lost: {losses}"]
+        # Hangman image.
+        lines.extend(self.frames.lines(self.game_state.image_idx))
+        # Underscores and guessed letters.
         output = [f'{char} ' if val else '_ ' for
                   char, val in self.game_state.puzzle]
-        self.display_message(f'{"".join(output)}\n\n')
+        lines.extend((self._indent + ''.join(output),
+                      self._indent, self._indent))
+        if clear:
+            self.screen.draw(lines)
+        else:
+            print('\n'.join(lines), flush=True)
+            self.screen.forget()
+        if start:
+            _UPDATE_SCREEN_TIME.observe(perf_counter_ns() - start)
 
-    @staticmethod
-    def clear_terminal() -> None:
+    def clear_terminal(self) -> None:
         """Clear the terminal.
 
         This method is intended to support both Posix and Windows.
-        Disabled on Linux if not in a terminal.
         """
-        if (sys.platform.startswith('linux') and
-                'TERM' not in os.environ):
-            return
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.screen.clear()
 
     def print_slowly(self,
                      message: str,
@@ -357,7 +398,9 @@ class UI:
                      indent: bool = True) -> None:
         """Print message one character at a time.
 
-        Pauses for 1/speed seconds between characters
+        Pauses for 1/speed seconds between characters, scaled by the
+        pacer's speed. Pressing a key prints the rest of the message
+        immediately.
 
         Parameters
         ----------
@@ -375,36 +418,144 @@ class UI:
         except ZeroDivisionError:
             self.display_message("Invalid speed. Defaulting to speed = 4")
             delay = 0.25
-        for line in message.split('\n'):
-            if indent:
-                print(self._indent, end='')
-            for char in line:
-                sleep(delay)
-                print(char, flush=True, end='')
-            print(end=end)
+        with self.pacer.animation():
+            for line in message.split('\n'):
+                if indent:
+                    print(self._indent, end='')
+                self.pacer.write_slowly(line, delay)
+                print(end=end, flush=True)
 
     def display_exit_dialog(self) -> None:
         """Dialog before quitting."""
         self.display_message(f"\nBye {self.game_state.player_name}.")
 
 
+class AutoPlayerUI(UI):
+    """User interface in which the computer guesses the letters.
+
+    Guesses are made by a FrequencySolver.
+    """
+
+    def get_guess(self) -> str:
+        """Return the solver's guess.
+
+        Returns
+        -------
+        str
+            The guess - a single character or a whole word.
+        """
+        solver = FrequencySolver(get_pattern_index(self.game_state.category))
+        guess = solver.next_guess(self.game_state.pattern,
+                                  self.game_state.guesses)
+        print("Guess a letter: ", end='')
+        self.print_slowly(guess, indent=False)
+        return guess
+
+
+class SpeedRunUI(UI):
+    """User interface that times each game, with a timer on screen.
+
+    The timer runs from the first sight of the puzzle until the game
+    ends, and is shown at the end of the score line while waiting for
+    a guess. It is stopped, and hidden, while the help screen is shown.
+
+    Attributes
+    ----------
+    best : float | None
+        Fastest winning game so far, in seconds.
+    """
+
+    tick_interval = 0.1
+
+    # Column of the timer on the score line.
+    _TIMER_COLUMN = 30
+
+    def __init__(self, game_state: GameState,
+                 pacer: Pacer | None = None,
+                 frames: FrameSet | None = None) -> None:
+        super().__init__(game_state, pacer, frames)
+        self.best: float | None = None
+        # When the current game started, or None between games.
+        self._started: float | None = None
+
+    def display_game_start_screen(self) -> None:
+        """Inform user of word length, then start the timer."""
+        super().display_game_start_screen()
+        self._started = monotonic()
+
+    def display_help(self) -> None:
+        """Display Help screen, with the timer stopped."""
+        started, self._started = self._started, None
+        paused = monotonic()
+        try:
+            super().display_help()
+        finally:
+            if started is not None:
+                self._started = started + monotonic() - paused
+
+    def tick(self) -> None:
+        """Show the time taken so far."""
+        if self._started is not None:
+            self.screen.write_at(1, self._TIMER_COLUMN,
+                                 f"Time: {monotonic() - self._started:.1f} s")
+
+    def display_game_result(self, is_winner: bool) -> None:
+        """Congratulate or console player, with the time taken."""
+        elapsed = monotonic() - (self._started or monotonic())
+        self._started = None
+        super().display_game_result(is_winner)
+        if is_winner and (self.best is None or elapsed < self.best):
+            self.best = elapsed
+            self.display_message(f"Time: {elapsed:.1f} s, a new best.")
+        elif self.best is not None:
+            self.display_message(f"Time: {elapsed:.1f} s, "
+                                 f"best: {self.best:.1f} s.")
+        else:
+            self.display_message(f"Time: {elapsed:.1f} s.")
+
+
 class Hangman:
-    """Game logic class.
+    """Terminal front end for GameEngine.
 
     Attributes
     ----------
+    self.engine: GameEngine
+        The rules of the game.
     self.state: GameState
-        Game state manager.
+        Game state manager, shared by engine and ui.
     self.ui: UI
         User interface.
+    self.journal: Journal | None
+        Where finished games are saved, if anywhere.
     """
 
-    def __init__(self) -> None:
-        """Constructor of game logic class."""
-        self.state = GameState()
-        self.ui = UI(self.state)
-        self.wins: int = 0
-        self.losses: int = 0
+    def __init__(self, ui_class: type[UI] = UI,
+                 pacer: Pacer | None = None,
+                 frames: FrameSet | None = None,
+                 journal: Journal | None = None,
+                 engine_class: type[GameEngine] = GameEngine) -> None:
+        """Constructor of game logic class.
+
+        Parameters
+        ----------
+        ui_class: type[UI]
+            The user interface class, UI or AutoPlayerUI.
+        pacer: Pacer | None
+            Scheduler for delays, passed to the user interface.
+        frames: FrameSet | None
+            Hangman drawings, one more than the number of lives.
+        journal: Journal | None
+            Where finished games are saved, if anywhere.
+        engine_class: type[GameEngine]
+            The rules, GameEngine or EvilEngine.
+        """
+        frames = frames or default_frames()
+        self.engine = engine_class(frames.lives)
+        self.state = self.engine.state
+        self.ui = ui_class(self.state, pacer, frames)
+        self.journal = journal
+        if journal:
+            self.engine.listeners.append(journal.record)
 
     def play_game(self) -> bool:
         """Play game.
@@ -418,77 +569,39 @@ class Hangman:
         """
         self.ui.update_screen(clear=False)
 
-        while self.state.remaining_letters:
-            # Update the game state from player guess.
-            # Get new guess
+        while True:
             new_guess = self.ui.get_guess()
             if new_guess == '?':
                 self.ui.display_help()
                 continue
-            self.update_game_state(new_guess)
-            # Display the result.
-            self.ui.update_screen()
-            if self.is_good_guess():
+            if new_guess == '!':
+                self.ui.display_hint()
+                continue
+            result = self.engine.guess(new_guess)
+            if result.outcome is Outcome.REPEATED:
                 self.ui.display_message(
-                    f"{self.state.current_guess} is correct.")
-            else:
+                    f"You've already guessed '{result.guess}'")
+                continue
+            if result.outcome is Outcome.INVALID:
                 self.ui.display_message(
-                    f"{self.state.current_guess} is wrong.")
-
-            # Return False if hangman complete.
-            if self.player_loses():
-                self.losses += 1
-                self.state.score['losses'] = self.losses
-                return False
-        self.wins += 1
-        self.state.score['wins'] = self.wins
-        return True
+                    "Guesses must be one letter or the whole "
+                    f"{len(self.state.word)} letter word.")
+                continue
+            # Display the result.
+            self.ui.update_screen()
+            self.ui.display_message(
+                f"{result.guess} is {result.outcome.value}.")
+            if result.is_over:
+                return self.state.is_solved
 
     def initialise_game(self, puzzle_word: str) -> None:
-        """Post-instantiation initialisation.
-
-        Complete the initialisation from puzzle_word.
-        """
-        self.state.word = puzzle_word
-        self.state.initialise_game_state()
-
-    def update_game_state(self, new_guess: str) -> None:
-        """Update game attributes according to current guess.
-
-        Guess may be a single letter or the entire word.
-        - update GameState::current_guess
-        - update GameState::guesses
-        Then tell GameState() instance to manage its own update,
-        """
-        self.state.current_guess = new_guess
-        # state.guesses is usually single letters but may
-        # be a whole word.
-        self.state.guesses.add(new_guess)
-        self.state.update_state_on_guess()
-
-    def is_good_guess(self) -> bool:
-        """Return True if current guess in puzzle word."""
-        return self.state.current_guess in self.state.word
-
-    def player_wins(self) -> None:
-        """Handle player winning.
-
-        Game is won when word is guessed before final
-        hangman image is displayed.
-        """
-        self.state.score['wins'] += 1
-
-    def player_loses(self) -> bool:
-        """Return True if player has lost.
-
-        Game is lost when final hangman image is displayed.
-        """
-        return self.state.image_idx == len(art()) - 1
+        """Start a new game of puzzle_word."""
+        self.engine.start(puzzle_word)
 
     def do_quit(self) -> None:
         """Exit the program."""
         self.ui.display_exit_dialog()
-        sleep(2)
+        self.ui.pacer.sleep(2)
         sys.exit(0)
 
 
@@ -504,19 +617,31 @@ def new_game(game: Hangman) -> None:
         Instance of the game logic class.
     """
     state = game.state
-    state.score = {'wins': game.wins, 'losses': game.losses}
     ui = game.ui
 
     # player_name initialised only in first game.
     if state.player_name == '':
         state.player_name = ui.do_welcome()
+        if game.journal:
+            # Carry on from the player's saved score.
+            game.engine.wins, game.engine.losses = game.journal.score(
+                state.player_name)
+        report_word_files()
         while True:
-            # Repeat query if prompt returns empty string.
+            # Repeat query if prompt returns empty string, or the
+            # category has been dropped since it was listed.
             categories = tuple(lexicon_dict.keys())
             category = ui.prompt_category(categories)
-            if category:
-                state.category = category
-                break
+            if category not in lexicon_dict:
+                continue
+            try:
+                lexicon_dict.load(category)
+            except ValueError as exc:
+                ui.display_message(f"Sorry, {category.title()} is not "
+                                   f"available. {exc}.")
+                continue
+            state.category = category
+            break
 
     ui.display_intro()
 
@@ -539,6 +664,174 @@ def new_game(game: Hangman) -> None:
     state.reset_current_game()
 
 
+def report_word_files() -> None:
+    """Print the results of word list files read since the last report.
+
+    Only files with rejected lines, and dropped categories, are shown.
+    """
+    for report in word_file_reports():
+        if report.error:
+            print(f"Category '{report.category}' is not available. "
+                  f"{report.error}.")
+        elif report.stats.rejected:
+            print(f"{report.file_name.name}: {report.stats.accepted:,} "
+                  f"words, {report.stats.rejected:,} of "
+                  f"{report.stats.lines:,} lines rejected "
+                  f"({report.stats.encoding}).")
+
+
+def add_categories(args: argparse.Namespace) -> None:
+    """Add the categories requested on the command line.
+
+    Raises
+    ------
+    ValueError
+        If a category cannot be added.
+    """
+    if args.length:
+        add_length_category(*args.length)
+    if args.words:
+        add_file_category(args.words)
+    if args.word_dir:
+        add_word_directory(args.word_dir)
+
+
+def get_frames(args: argparse.Namespace) -> FrameSet:
+    """Return the hangman drawings requested on the command line.
+
+    Raises
+    ------
+    ValueError
+        If the frames cannot be loaded, or lives is less than 1.
+    """
+    frames = load_frames(args.frames) if args.frames else default_frames()
+    if args.lives is not None:
+        frames = frames.with_lives(args.lives)
+    return frames
+
+
+def score_words(args: argparse.Namespace) -> None:
+    """Score every word in every category and print a summary.
+
+    A word's score is the number of wrong guesses that the computer
+    player makes before finding it.
+    """
+    for category in lexicon_dict:
+        scores = score_category(category, add_categories, (args,))
+        mean = sum(scores) / len(scores) if scores else 0.0
+        print(f"{category.title()}: {len(scores):,} words, "
+              f"average {mean:.2f} wrong guesses")
+
+
+def init_worker(args: argparse.Namespace) -> None:
+    """Set up the categories of a worker process as in the parent."""
+    add_categories(args)
+    if args.difficulty:
+        use_difficulty_tier(args.difficulty, add_categories, (args,))
+
+
+def simulate(args: argparse.Namespace) -> None:
+    """Run and report a headless simulation."""
+    if args.category not in lexicon_dict:
+        print(f"Unknown category '{args.category}'.")
+        sys.exit(1)
+    if args.difficulty:
+        # Score the words once, here, so that workers load the cached
+        # scores rather than each scoring the category.
+        lexicon_dict.load(args.category)
+    seed = 0 if args.seed is None else args.seed
+    config = SimulationConfig(args.simulate, args.category, args.strategy,
+                              seed, args.workers)
+    result, elapsed = run_simulation(config,
+                                     initializer=init_worker,
+                                     initargs=(args,))
+    print(format_report(result, elapsed))
+
+
+def replay_game(game: RecordedGame, engine: GameEngine, ui: UI) -> None:
+    """Show a recorded game, pausing for the recorded time between guesses.
+
+    A key press skips to the end of the game.
+    """
+    engine.lives = game.lives
+    engine.state.player_name = game.player
+    engine.state.category = game.category
+    engine.start(game.word)
+    with ui.pacer.animation():
+        ui.clear_terminal()
+        ui.display_message(f"{game.player}: {game.category.title()}")
+        ui.update_screen(clear=False)
+        for guess, delay in zip(game.guesses, game.delays):
+            ui.pacer.sleep(delay)
+            result = engine.guess(guess)
+            ui.update_screen()
+            ui.display_message(f"{result.guess} is {result.outcome.value}.")
+        ui.display_message(f"{game.player} {'won' if game.won else 'lost'}.")
+        ui.pacer.sleep(1)
+
+
+def replay(args: argparse.Namespace, frames: FrameSet) -> None:
+    """Show, or validate, the games in a recording."""
+    try:
+        games = read_games(args.replay)
+        if args.validate:
+            result = validate(games)
+            print(format_validation(result))
+            if result.mismatches:
+                sys.exit(1)
+            return
+        pacer = Pacer(args.speed)
+        engine = GameEngine()
+        for game in games:
+            ui = UI(engine.state, pacer, frames.with_lives(game.lives))
+            replay_game(game, engine, ui)
+    except (OSError, RecordingError, ValueError) as exc:
+        print(exc)
+        sys.exit(1)
+
+
+def show_leaderboard(args: argparse.Namespace) -> None:
+    """Print the leaderboard requested on the command line."""
+    category = args.leaderboard.lower() or None
+    title = "Leaderboard"
+    if category:
+        title += f" - {category.title()}"
+    if args.days:
+        title += f" - last {args.days} days"
+    try:
+        with Leaderboard() as leaderboard:
+            standings = leaderboard.top(args.top, category, args.days)
+    except sqlite3.Error as exc:
+        print(f"Unable to read the leaderboard: {exc}")
+        sys.exit(1)
+    print(format_leaderboard(standings, title))
+
+
+def open_leaderboard(batch_size: int,
+                     journal: Journal | None) -> Leaderboard | None:
+    """Return the leaderboard, or None if unavailable.
+
+    A new leaderboard is filled from the journal.
+    """
+    try:
+        leaderboard = Leaderboard(batch_size=batch_size)
+        if journal and leaderboard.is_empty():
+            leaderboard.add_records(journal.records())
+    except sqlite3.Error as exc:
+        print(f"Finished games will not be ranked: {exc}")
+        return None
+    return leaderboard
+
+
+def open_journal(batch_size: int) -> Journal | None:
+    """Return the journal of finished games, or None if unavailable."""
+    try:
+        return Journal(batch_size=batch_size)
+    except OSError as exc:
+        print(f"Finished games will not be saved: {exc}")
+        return None
+
+
 def main():
     """Main loop.
 
@@ -546,7 +839,95 @@ def main():
     persist for the life of program.
     Play game repeatedly until player quits.
     """
-    new_game_session = Hangman()
+    args = parse_args()
+    if not (args.metrics or args.metrics_file):
+        run(args)
+        return
+    METRICS.enabled = True
+    try:
+        if args.metrics_file:
+            METRICS.write_periodically(args.metrics_file)
+    except OSError as exc:
+        print(f"Unable to write metrics: {exc}")
+        sys.exit(1)
+    try:
+        run(args)
+    finally:
+        METRICS.stop()
+        if args.metrics:
+            METRICS.dump()
+
+
+def run(args: argparse.Namespace) -> None:
+    """Do what the command line asks."""
+    if args.leaderboard is not None:
+        show_leaderboard(args)
+        return
+    try:
+        add_categories(args)
+        frames = get_frames(args)
+    except ValueError as exc:
+        print(exc)
+        sys.exit(1)
+    if args.score_words:
+        score_words(args)
+        return
+    if args.difficulty:
+        use_difficulty_tier(args.difficulty, add_categories, (args,))
+    if args.seed is not None:
+        secret_words.reseed(args.seed)
+    if args.simulate is not None:
+        simulate(args)
+        return
+    if args.replay:
+        replay(args, frames)
+        return
+    run_games(args, frames)
+
+
+def run_games(args: argparse.Namespace, frames: FrameSet) -> None:
+    """Play games in the terminal, or serve them, saving the results."""
+    # A terminal game writes each game as it ends.
+    batch_size = 64 if args.serve is not None else 1
+    journal = leaderboard = recorder = None
+    if not args.no_journal:
+        journal = open_journal(batch_size)
+        leaderboard = open_leaderboard(batch_size, journal)
+    try:
+        if args.record:
+            recorder = Recorder(args.record)
+    except OSError as exc:
+        print(f"Unable to record games: {exc}")
+        sys.exit(1)
+    engine_class = EvilEngine if args.evil else GameEngine
+    try:
+        if args.serve is not None:
+            hangman_server = HangmanServer(frames, journal=journal,
+                                           leaderboard=leaderboard,
+                                           engine_class=engine_class)
+            if recorder:
+                hangman_server.listeners.append(recorder.record)
+            try:
+                asyncio.run(serve(args.host, args.serve, hangman_server))
+            except KeyboardInterrupt:
+                pass
+            return
+        ui_class = (AutoPlayerUI if args.auto
+                    else SpeedRunUI if args.speedrun else UI)
+        game = Hangman(ui_class, Pacer(args.speed), frames, journal,
+                       engine_class)
+        for listener in (leaderboard, recorder):
+            if listener:
+                game.engine.listeners.append(listener.record)
+        play(game)
+    finally:
+        for store in (journal, leaderboard, recorder):
+            if store:
+                store.close()
+
+
+def play(new_game_session: Hangman) -> None:
+    """Play games in the terminal until the player quits."""
     while True:
         try:
             new_game(new_game_session)
@@ -97,6 +97,22 @@ mkdir -p "$DESKTOP_DIR"
 cp hangman.py "$APP_DIR/hangman-cli" || handle_error
 cp ascii_art.py "$APP_DIR" || handle_error
 cp lexicon.py "$APP_DIR" || handle_error
+cp filecache.py "$APP_DIR" || handle_error
+cp wordsource.py "$APP_DIR" || handle_error
+cp patterns.py "$APP_DIR" || handle_error
+cp solver.py "$APP_DIR" || handle_error
+cp simulate.py "$APP_DIR" || handle_error
+cp difficulty.py "$APP_DIR" || handle_error
+cp terminal.py "$APP_DIR" || handle_error
+cp gamestate.py "$APP_DIR" || handle_error
+cp engine.py "$APP_DIR" || handle_error
+cp journal.py "$APP_DIR" || handle_error
+cp leaderboard.py "$APP_DIR" || handle_error
+cp recording.py "$APP_DIR" || handle_error
+cp metrics.py "$APP_DIR" || handle_error
+cp evil.py "$APP_DIR" || handle_error
+cp options.py "$APP_DIR" || handle_error
+cp server.py "$APP_DIR" || handle_error
 
 # Copy the icon file
 cp hangman-cli.ico "$ICON_DIR" || handle_error
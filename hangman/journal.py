@@ -0,0 +1,311 @@
+"""Append-only journal of finished games for Hangman-CLI game.
+
+Each finished game is appended to the journal file as one line of JSON.
+Lines are buffered and written in batches, and the sync policy decides
+how often the file is flushed to disk with fsync:
+
+- 'always': every game is written and synced as soon as it ends.
+- 'batch': games are written and synced once per batch.
+- 'never': games are written once per batch, and syncing is left to the
+  operating system.
+
+Win and loss totals are kept in memory. Every compact_every games, they
+are saved to a snapshot together with the length of the journal that
+they cover. Opening a journal then only loads the snapshot and replays
+the games after it, however long the history is.
+
+Several processes can share a journal. Each one holds a lock on the
+journal file while it writes games or a snapshot, and first replays the
+games that the others have written since it last looked, so that its
+totals, and the snapshots it saves, count every game. The lock uses
+flock(), so on Windows, where there is none, writes are not locked.
+
+A crash can leave a partly written last line. It is ignored and cut off
+when the journal is next opened. Any other line that is not a valid
+record is skipped, and reading carries on from the next line.
+"""
+
+import contextlib
+import json
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+
+from engine import GameRecord
+
+if sys.platform != 'win32':
+    import fcntl
+
+JOURNAL_NAME = 'games.jsonl'
+SNAPSHOT_NAME = 'stats.json'
+SYNC_POLICIES = ('always', 'batch', 'never')
+
+_SNAPSHOT_VERSION = 1
+
+
+def data_dir() -> Path:
+    """Return the directory used for saved games.
+
+    HANGMAN_DATA_DIR overrides the default of $XDG_DATA_HOME/hangman-cli.
+    """
+    if 'HANGMAN_DATA_DIR' in os.environ:
+        return Path(os.environ['HANGMAN_DATA_DIR'])
+    base = (os.environ.get('XDG_DATA_HOME')
+            or Path.home() / '.local' / 'share')
+    return Path(base) / 'hangman-cli'
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """Return record as a journal line."""
+    return json.dumps({'time': record.time, 'player': record.player,
+                       'category': record.category, 'word': record.word,
+                       'guesses': record.guesses, 'won': record.won},
+                      separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def decode_record(line: bytes) -> GameRecord:
+    """Return the GameRecord of a journal line.
+
+    Raises
+    ------
+    ValueError
+        If line is not a valid record.
+    """
+    try:
+        data = json.loads(line)
+        return GameRecord(float(data['time']), data['player'],
+                          data['category'], data['word'],
+                          tuple(data['guesses']), bool(data['won']))
+    except (KeyError, TypeError) as exc:
+        raise ValueError("Invalid journal record.") from exc
+
+
+class Journal:
+    """Append-only journal with win and loss totals.
+
+    Use as a context manager, or call close(), so that buffered games
+    are written.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, directory: Path | None = None,
+                 batch_size: int = 64,
+                 sync: str = 'batch',
+                 compact_every: int = 10_000) -> None:
+        """Open, or create, the journal in directory.
+
+        Parameters
+        ----------
+        directory: Path | None
+            Directory of the journal and snapshot, default: data_dir().
+        batch_size: int
+            Number of games buffered before they are written.
+        sync: str
+            One of SYNC_POLICIES.
+        compact_every: int
+            Number of games journalled between snapshots.
+
+        Raises
+        ------
+        OSError
+            If the journal cannot be opened.
+        ValueError
+            If sync is not one of SYNC_POLICIES.
+        """
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Unknown sync policy '{sync}'.")
+        self.directory = directory or data_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / JOURNAL_NAME
+        self.batch_size = 1 if sync == 'always' else max(1, batch_size)
+        self.sync = sync
+        self.compact_every = compact_every
+        self._totals: dict[tuple[str, str], list[int]] = {}
+        self._buffer: list[bytes] = []
+        self._since_snapshot = 0
+        # Length of the journal counted in the totals.
+        self._end = 0
+        # pylint: disable-next=consider-using-with
+        self._file = open(self.path, 'ab+')
+        with self._locked():
+            self._replay(self._load_snapshot())
+            if self._since_snapshot >= self.compact_every:
+                self._save_snapshot()
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the lock on the journal file, where there is one."""
+        if sys.platform != 'win32':
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform != 'win32':
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _load_snapshot(self) -> int:
+        """Load totals from the snapshot and return its journal offset.
+
+        A missing, unreadable or out of date snapshot gives offset 0.
+        """
+        try:
+            data = json.loads((self.directory / SNAPSHOT_NAME).read_bytes())
+            if (data['version'] != _SNAPSHOT_VERSION or
+                    data['offset'] > self.path.stat().st_size):
+                return 0
+            self._totals = {(player, category): [wins, losses]
+                            for player, category, wins, losses
+                            in data['totals']}
+            return int(data['offset'])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._totals = {}
+            return 0
+
+    def _replay(self, offset: int) -> None:
+        """Add the games journalled after offset to the totals.
+
+        A partly written last line is cut off. Call with the lock held.
+        """
+        good_end = offset
+        for end, record in self._read_from(offset):
+            if record is not None:
+                self._count(record)
+                self._since_snapshot += 1
+            good_end = end
+        if good_end < self._file.seek(0, os.SEEK_END):
+            self._file.truncate(good_end)
+        self._end = good_end
+
+    def _read_from(self, offset: int
+                   ) -> Iterator[tuple[int, GameRecord | None]]:
+        """Yield (end offset, record) for each complete line after offset.
+
+        The record is None for a line that is not a valid record. A
+        partly written last line is not read.
+        """
+        self._file.seek(offset)
+        for line in self._file:
+            if not line.endswith(b'\n'):
+                return
+            offset += len(line)
+            try:
+                yield offset, decode_record(line)
+            except ValueError:
+                yield offset, None
+
+    def _count(self, record: GameRecord) -> None:
+        """Add record to the win and loss totals."""
+        totals = self._totals.setdefault((record.player, record.category),
+                                         [0, 0])
+        totals[0 if record.won else 1] += 1
+
+    def record(self, record: GameRecord) -> None:
+        """Journal a finished game.
+
+        Suitable as a GameEngine listener.
+        """
+        self._count(record)
+        self._buffer.append(encode_record(record))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered games, and compact if a snapshot is due."""
+        if not self._buffer:
+            return
+        with self._locked():
+            self._write_buffer()
+            if self._since_snapshot >= self.compact_every:
+                self._save_snapshot()
+
+    def compact(self) -> None:
+        """Save the totals to a snapshot of the whole journal."""
+        with self._locked():
+            self._write_buffer()
+            self._save_snapshot()
+
+    def _write_buffer(self) -> None:
+        """Count games written by others, then write buffered games.
+
+        Call with the lock held.
+        """
+        self._replay(self._end)
+        if not self._buffer:
+            return
+        self._file.write(b''.join(self._buffer))
+        self._file.flush()
+        if self.sync != 'never':
+            os.fsync(self._file.fileno())
+        self._end = self._file.tell()
+        self._since_snapshot += len(self._buffer)
+        self._buffer = []
+
+    def _save_snapshot(self) -> None:
+        """Save the totals to a snapshot. Call with the lock held."""
+        snapshot = {
+            'version': _SNAPSHOT_VERSION,
+            'offset': self._end,
+            'totals': [[player, category, wins, losses]
+                       for (player, category), (wins, losses)
+                       in self._totals.items()],
+        }
+        snapshot_file = self.directory / SNAPSHOT_NAME
+        tmp_file = snapshot_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as file:
+            json.dump(snapshot, file, separators=(',', ':'))
+            file.flush()
+            if self.sync != 'never':
+                os.fsync(file.fileno())
+        os.replace(tmp_file, snapshot_file)
+        self._since_snapshot = 0
+
+    def _catch_up(self) -> None:
+        """Count the games that others have written since the last look."""
+        if self._file.closed:
+            return
+        with self._locked():
+            self._replay(self._end)
+
+    def score(self, player: str) -> tuple[int, int]:
+        """Return (wins, losses) of player in all categories."""
+        self._catch_up()
+        wins = losses = 0
+        for (name, _), (won, lost) in self._totals.items():
+            if name == player:
+                wins += won
+                losses += lost
+        return wins, losses
+
+    def totals(self) -> dict[tuple[str, str], tuple[int, int]]:
+        """Return (wins, losses) for each (player, category)."""
+        self._catch_up()
+        return {key: (wins, losses)
+                for key, (wins, losses) in self._totals.items()}
+
+    def records(self) -> Iterator[GameRecord]:
+        """Yield every game in the journal, oldest first."""
+        self.flush()
+        for _, record in self._read_from(0):
+            if record is not None:
+                yield record
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self) -> None:
+        """Write buffered games and close the journal."""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
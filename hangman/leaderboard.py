@@ -0,0 +1,255 @@
+"""SQLite leaderboard for Hangman-CLI game.
+
+Finished games are buffered and written in batches, one transaction per
+batch. Each batch adds rows to the games table, and adds to the summary
+tables that the leaderboard is read from:
+
+- players: wins and losses of each player.
+- player_categories: wins and losses of each player in each category.
+- daily: wins and losses of each player in each category on each day.
+
+Each summary table is indexed in leaderboard order, so the top players
+overall, in a category, or over recent days are found without reading
+the history of games. The database uses write-ahead logging, so readers
+do not block the game that is writing.
+"""
+
+import sqlite3
+from collections import namedtuple
+from collections.abc import Iterable
+from pathlib import Path
+from time import time
+from types import TracebackType
+
+from engine import GameRecord
+from journal import data_dir
+
+LEADERBOARD_NAME = 'leaderboard.db'
+
+SECONDS_PER_DAY = 86400
+
+Standing = namedtuple('Standing', ['player', 'wins', 'losses'])
+"""A player's place on the leaderboard.
+
+player: str
+    The player's name.
+wins: int
+    Games won.
+losses: int
+    Games lost.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    player TEXT NOT NULL,
+    category TEXT NOT NULL,
+    word TEXT NOT NULL,
+    guesses INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_rank
+    ON players (wins DESC, losses, player);
+CREATE TABLE IF NOT EXISTS player_categories (
+    category TEXT NOT NULL,
+    player TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    PRIMARY KEY (category, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_categories_rank
+    ON player_categories (category, wins DESC, losses, player);
+CREATE TABLE IF NOT EXISTS daily (
+    day INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    player TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    PRIMARY KEY (day, category, player)
+) WITHOUT ROWID;
+"""
+
+_ADD_PLAYER = """
+INSERT INTO players (player, wins, losses) VALUES (?, ?, ?)
+ON CONFLICT (player) DO UPDATE
+SET wins = wins + excluded.wins, losses = losses + excluded.losses
+"""
+
+_ADD_PLAYER_CATEGORY = """
+INSERT INTO player_categories (category, player, wins, losses)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (category, player) DO UPDATE
+SET wins = wins + excluded.wins, losses = losses + excluded.losses
+"""
+
+_ADD_DAILY = """
+INSERT INTO daily (day, category, player, wins, losses)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (day, category, player) DO UPDATE
+SET wins = wins + excluded.wins, losses = losses + excluded.losses
+"""
+
+
+def _add(totals: dict[tuple, list[int]], key: tuple, won: bool) -> None:
+    """Add a win or loss to totals[key]."""
+    counts = totals.setdefault(key, [0, 0])
+    counts[0 if won else 1] += 1
+
+
+class Leaderboard:
+    """Win and loss table of every player, stored with sqlite3.
+
+    Use as a context manager, or call close(), so that buffered games
+    are written. A leaderboard may be used from any thread, but only
+    from one thread at a time.
+    """
+
+    def __init__(self, path: Path | None = None,
+                 batch_size: int = 64) -> None:
+        """Open, or create, the leaderboard database.
+
+        Parameters
+        ----------
+        path: Path | None
+            Database file, default: LEADERBOARD_NAME in data_dir().
+        batch_size: int
+            Number of games buffered before they are written.
+
+        Raises
+        ------
+        sqlite3.Error
+            If the database cannot be opened.
+        """
+        self.path = path or data_dir() / LEADERBOARD_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self._buffer: list[GameRecord] = []
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        with self._db:
+            self._db.executescript(_SCHEMA)
+
+    def is_empty(self) -> bool:
+        """Return True if no games have been recorded."""
+        self.flush()
+        return self._db.execute(
+            'SELECT NOT EXISTS (SELECT 1 FROM games)').fetchone()[0] == 1
+
+    def record(self, record: GameRecord) -> None:
+        """Add a finished game to the leaderboard.
+
+        Suitable as a GameEngine listener.
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_records(self, records: Iterable[GameRecord]) -> None:
+        """Add many finished games, for example from the journal."""
+        for record in records:
+            self._buffer.append(record)
+            if len(self._buffer) >= 10_000:
+                self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered games in one transaction."""
+        if not self._buffer:
+            return
+        players: dict[tuple, list[int]] = {}
+        categories: dict[tuple, list[int]] = {}
+        days: dict[tuple, list[int]] = {}
+        for record in self._buffer:
+            day = int(record.time // SECONDS_PER_DAY)
+            _add(players, (record.player,), record.won)
+            _add(categories, (record.category, record.player), record.won)
+            _add(days, (day, record.category, record.player), record.won)
+        with self._db:
+            self._db.executemany(
+                'INSERT INTO games (time, player, category, word, guesses, '
+                'won) VALUES (?, ?, ?, ?, ?, ?)',
+                [(record.time, record.player, record.category, record.word,
+                  len(record.guesses), record.won)
+                 for record in self._buffer])
+            self._db.executemany(_ADD_PLAYER, [
+                (*key, *counts) for key, counts in players.items()])
+            self._db.executemany(_ADD_PLAYER_CATEGORY, [
+                (*key, *counts) for key, counts in categories.items()])
+            self._db.executemany(_ADD_DAILY, [
+                (*key, *counts) for key, counts in days.items()])
+        self._buffer = []
+
+    def top(self, count: int = 10, category: str | None = None,
+            days: int | None = None) -> list[Standing]:
+        """Return the leading players, most wins first.
+
+        Parameters
+        ----------
+        count: int
+            Number of players to return.
+        category: str | None
+            Only count games in this category.
+        days: int | None
+            Only count games from the last days days, including today.
+
+        Returns
+        -------
+        list[Standing]
+            Players ordered by wins, then fewest losses, then name.
+        """
+        self.flush()
+        if days is not None:
+            first_day = int(time() // SECONDS_PER_DAY) - days + 1
+            where = 'day >= ?'
+            params: tuple = (first_day,)
+            if category is not None:
+                where += ' AND category = ?'
+                params += (category,)
+            sql = ('SELECT player, SUM(wins) AS won, SUM(losses) AS lost '
+                   f'FROM daily WHERE {where} GROUP BY player '
+                   'ORDER BY won DESC, lost, player LIMIT ?')
+        elif category is not None:
+            sql = ('SELECT player, wins, losses FROM player_categories '
+                   'WHERE category = ? '
+                   'ORDER BY wins DESC, losses, player LIMIT ?')
+            params = (category,)
+        else:
+            sql = ('SELECT player, wins, losses FROM players '
+                   'ORDER BY wins DESC, losses, player LIMIT ?')
+            params = ()
+        return [Standing(*row)
+                for row in self._db.execute(sql, (*params, count))]
+
+    def close(self) -> None:
+        """Write buffered games and close the database."""
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+    def __enter__(self) -> 'Leaderboard':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+def format_leaderboard(standings: list[Standing], title: str) -> str:
+    """Return printable leaderboard."""
+    if not standings:
+        return f"{title}\nNo games have been played yet."
+    width = max(len(standing.player) for standing in standings)
+    lines = [title]
+    for place, standing in enumerate(standings, 1):
+        lines.append(f"{place:>3}. {standing.player:<{width}}  "
+                     f"Won: {standing.wins:>6,}  Lost: {standing.losses:>6,}")
+    return '\n'.join(lines)
@@ -10,60 +10,234 @@ of the category including the appropriate indefinite article.
 For example, for the category "countries", we get a list of countries
 and the string "a country".
 
+Categories are registered in lexicon_dict with a loader, and the word list
+is only built the first time the category is looked up, so importing this
+module does not read the system dictionary.
+
+Built word lists are cached on disk (see filecache.load_cached), keyed on
+the path, size and modification time of their source files, so that later
+launches load them in one read rather than parsing the text again.
+
+System dictionary words are held in a LengthIndex, which groups words by
+length. Categories such as 'short words' are LengthRange views over the
+index, so any range of word lengths can be offered without copying or
+rescanning the words.
+
+Large word lists can be added with add_file_category(). These are read
+through a MappedWordList, so the words are never all loaded into memory.
+
+A directory of word list files, which may be plain text or gzip or xz
+compressed, can be added with add_word_directory(). Each file becomes a
+category, and the files are decoded in parallel in the background. A file
+that cannot be read, or has no valid words, is dropped from lexicon_dict
+when its read finishes. Each finished read is reported by
+word_file_reports().
+
 This module also contains help text.
 """
 
-from collections import namedtuple
+from bisect import bisect_right
+from collections import deque, namedtuple
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import cache, partial
 from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, BinaryIO
+
+from filecache import cache_name, load_cached
+from metrics import METRICS
+from patterns import PatternIndex
+from wordsource import MappedWordList, WordSequence, WordStore
+
+# Only --word-dir reads compressed files on a thread pool, so the modules
+# for that, which are slow to import, are imported when first needed.
+# pylint: disable=import-outside-toplevel
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+_SYSTEM_DICTIONARY_FILES = ("/usr/share/dict/words",
+                            "/usr/dict/words",
+                            "/usr/lib/dict/words")
+
+# Increment when the format of cached data changes.
+_CACHE_VERSION = 5
+
+
+# Word list file extensions, for plain, gzip and xz compressed files.
+_WORD_FILE_EXTENSIONS = ('.txt', '.gz', '.xz')
+
+_LOAD_TIME = METRICS.histogram('lexicon.load')
+
+# Bytes read from a word list file at a time.
+_CHUNK_SIZE = 1 << 20
+
+ScanStats = namedtuple('ScanStats',
+                       ['encoding', 'lines', 'accepted', 'rejected'])
+"""Statistics from scan_word_stream().
+
+encoding: str
+    The detected encoding, 'utf-8' or 'latin-1'.
+lines: int
+    Number of lines read.
+accepted: int
+    Number of lines accepted as words.
+rejected: int
+    Number of lines rejected, including blank lines, lines that are too
+    short, and lines that contain anything other than a single word.
+"""
+
+WordFileReport = namedtuple('WordFileReport',
+                            ['category', 'file_name', 'stats', 'error'])
+"""Result of reading a word list file added by add_word_directory().
+
+category: str
+    The category of the file.
+file_name: Path
+    The word list file.
+stats: ScanStats | None
+    Statistics of the file, or None if it could not be read.
+error: str
+    Why the category was dropped, or '' if it was not.
+"""
+
+
+def _detect_encoding(data: bytes) -> str:
+    """Return 'utf-8' if data is valid UTF-8, else 'latin-1'."""
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+
+def _detect_file_encoding(file_name: Path) -> str:
+    """Return the encoding of a plain word list file, from its first chunk.
+
+    See _detect_encoding().
+    """
+    with open(file_name, 'rb') as file:
+        data = file.read(_CHUNK_SIZE)
+    # Drop the last, possibly incomplete, line.
+    if len(data) == _CHUNK_SIZE and b'\n' in data:
+        data = data[:data.rindex(b'\n')]
+    return _detect_encoding(data)
+
+
+def scan_word_stream(stream: BinaryIO,
+                     min_len: int = 3) -> tuple[list[str], ScanStats]:
+    """Return the words in a binary word list stream, and statistics.
+
+    The whole stream is validated in a single pass, reading large chunks
+    that are cut at line ends. Each chunk has carriage returns removed
+    with bytes.translate, and is decoded, upper-cased and split into lines
+    in bulk. The encoding is detected once, from the first chunk.
+
+    Lines with white space around a single word are repaired. Other lines
+    that are not a single word of at least min_len letters (including
+    words with apostrophes) are rejected.
+    """
+    words: list[str] = []
+    encoding = ''
+    lines = 0
+    remainder = b''
+    while True:
+        chunk = stream.read(_CHUNK_SIZE)
+        data = remainder + chunk
+        remainder = b''
+        if chunk:
+            cut = data.rfind(b'\n') + 1
+            if cut:
+                data, remainder = data[:cut], data[cut:]
+            elif len(data) < 16 * _CHUNK_SIZE:
+                # No complete line yet.
+                remainder = data
+                continue
+        if data:
+            data = data.translate(None, b'\r')
+            encoding = encoding or _detect_encoding(data)
+            text = data.decode(encoding, 'replace').upper()
+            lines += text.count('\n') + (not text.endswith('\n'))
+            chunk_lines: Iterable[str] = text.split('\n')
+            if ' ' in text or '\t' in text:
+                # Repair lines with white space around the word.
+                chunk_lines = (line.strip(' \t') for line in chunk_lines)
+            words.extend(word for word in chunk_lines
+                         if len(word) >= min_len and word.isalpha())
+        if not chunk:
+            break
+    stats = ScanStats(encoding or 'utf-8', lines, len(words),
+                      lines - len(words))
+    return words, stats
+
+
+def _open_word_file(file_name: Path) -> BinaryIO:
+    """Open a plain, gzip or xz compressed word list for binary reading."""
+    if file_name.suffix == '.gz':
+        import gzip
+        return gzip.open(file_name, 'rb')  # type: ignore[return-value]
+    if file_name.suffix == '.xz':
+        import lzma
+        return lzma.open(file_name, 'rb')  # type: ignore[return-value]
+    return open(file_name, 'rb')
+
+
+def scan_word_file(file_name: Path,
+                   min_len: int = 3) -> tuple[list[str], ScanStats]:
+    """Return the words in a plain or compressed word list, and statistics.
+
+    See scan_word_stream().
+    """
+    with _open_word_file(file_name) as stream:
+        return scan_word_stream(stream, min_len)
 
 
 def is_valid_word_list(file_name: Path, max_bytes_to_read=1024) -> str:
     """Return encoding: str if file looks like a language dictionary
     else return empty string."""
-    encodings = ['utf-8', 'latin-1']
-    for enc in encodings:
-        try:
-            with open(file_name, 'r', encoding=enc) as file:
-                content = file.read(max_bytes_to_read)
-                lines = content.splitlines()  # Split content into lines
-
-                # Check for one word per line within the read content
-                for line in lines:
-                    if len(line.split()) != 1:
-                        return ''
-                    for char in line:
-                        if not char.isalpha() and char != "'":
-                            return ''
-                return enc
-        except UnicodeDecodeError:
-            # Try next encoding
-            continue
-    return ''
+    with open(file_name, 'rb') as file:
+        data = file.read(max_bytes_to_read)
+    # Drop the last, possibly incomplete, line.
+    if len(data) == max_bytes_to_read and b'\n' in data:
+        data = data[:data.rindex(b'\n')]
+    enc = _detect_encoding(data)
+    # Check for one word per line within the read content
+    for line in data.decode(enc).splitlines():
+        if len(line.split()) != 1:
+            return ''
+        for char in line:
+            if not char.isalpha() and char != "'":
+                return ''
+    return enc
 
 
-def get_system_dictionary(min_len: int = 3) -> list[str] | None:
-    """Return list of words or None."""
-    files = ("/usr/share/dict/words",
-             "/usr/dict/words",
-             "/usr/lib/dict/words")
-    enc = ''
-    lang_dict = None
-    for file in files:
+def find_system_dictionary() -> Path | None:
+    """Return path of the system dictionary file, or None if not found."""
+    for file in _SYSTEM_DICTIONARY_FILES:
         lang_dict = Path(file)
         if lang_dict.is_file():
-            enc = is_valid_word_list(Path(file))
-            break
-    if lang_dict:
-        with open(lang_dict, 'r', encoding=enc) as fp:
-            word_list = [line.strip() for line in fp.readlines()
-                         if "'" not in line and
-                         min_len <= len(line.strip())]
-            return word_list
-    else:
+            return lang_dict
+    return None
+
+
+def get_system_dictionary(min_len: int = 3) -> list[str] | None:
+    """Return list of words or None.
+
+    Returns None if there is no system dictionary, or if fewer than half
+    of its lines are valid words.
+    """
+    lang_dict = find_system_dictionary()
+    if lang_dict is None:
         return None
+    words, stats = scan_word_file(lang_dict, min_len)
+    if stats.accepted < stats.lines / 2:
+        return None
+    return words
+
 
+def _unique(words: Iterable[str]) -> list[str]:
+    """Return words with duplicates removed, preserving order."""
+    return list(dict.fromkeys(words))
 
-_SYSTEM_WORDS: list[str] | None = get_system_dictionary()
 
 _LEXICON_DICT = {
     'animals': """
@@ -175,52 +349,377 @@ _LEXICON_DICT = {
 }
 
 
-def _get_words_of_length(words, min_length, max_length) -> list[str]:
-    """Return words from language dictionary in length range."""
-    return [word.upper() for word in words
-            if min_length <= len(word) <= max_length]
+class LengthRange(WordSequence):
+    """Read-only view of the words in a range of LengthIndex buckets."""
+
+    def __init__(self, buckets: list[Sequence[str]]) -> None:
+        self._buckets = buckets
+        # _ends[i] is the number of words in buckets[0] to buckets[i].
+        self._ends: list[int] = []
+        total = 0
+        for bucket in buckets:
+            total += len(bucket)
+            self._ends.append(total)
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def _word(self, index: int) -> str:
+        bucket = bisect_right(self._ends, index)
+        start = self._ends[bucket - 1] if bucket else 0
+        return self._buckets[bucket][index - start]
+
+    def __iter__(self) -> Iterator[str]:
+        for bucket in self._buckets:
+            yield from bucket
+
+
+class LengthIndex:
+    """Words grouped into buckets by length.
+
+    The index is built in a single pass over the words. Words are
+    stored in upper case, without duplicates, and each bucket is packed
+    into a WordStore.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        buckets: dict[int, list[str]] = {}
+        for word in _unique(word.upper() for word in words):
+            buckets.setdefault(len(word), []).append(word)
+        self._buckets = {length: WordStore(bucket)
+                         for length, bucket in buckets.items()}
+
+    def lengths(self) -> list[int]:
+        """Return the word lengths present, in ascending order."""
+        return sorted(self._buckets)
+
+    def words(self, min_length: int, max_length: int) -> LengthRange:
+        """Return view of words with min_length <= length <= max_length."""
+        return LengthRange([self._buckets[length]
+                            for length in self.lengths()
+                            if min_length <= length <= max_length])
 
 
 Lexicon = namedtuple('Lexicon', ['word_list', 'singular'])
 
-lexicon_dict = {}
-if _SYSTEM_WORDS is not None:
-    lexicon_dict = {
-        'short words': Lexicon(_get_words_of_length(_SYSTEM_WORDS, 3, 5),
-                               singular='a short word'),
-        'medium length words': Lexicon(
-            _get_words_of_length(_SYSTEM_WORDS, 5, 8),
-            singular='a medium length word'),
-        'long words': Lexicon(_get_words_of_length(_SYSTEM_WORDS, 8, 50),
-                              singular='a long word'),
-    }
+
+class LexiconDict(Mapping[str, Lexicon]):
+    """Read-only mapping of category name to Lexicon.
+
+    Each category is registered with a loader function, which is called
+    the first time the category is looked up. Listing the categories
+    never loads any words.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: dict[str,
+                            tuple[Callable[[], Sequence[str]], str]] = {}
+        self._loaded: dict[str, Lexicon] = {}
+
+    def register(self, category: str,
+                 loader: Callable[[], Sequence[str]],
+                 singular: str) -> None:
+        """Add a category whose word list is built by loader() on demand.
+
+        Parameters
+        ----------
+        category: str
+            The category name, as shown to the player.
+        loader: Callable[[], Sequence[str]]
+            Function returning the word list.
+        singular: str
+            Singular form of the category with indefinite article.
+        """
+        self._loaders[category] = (loader, singular)
+        self._loaded.pop(category, None)
+
+    def load(self, category: str) -> Lexicon:
+        """Return the Lexicon of category, removing it if it fails to load.
+
+        Raises
+        ------
+        KeyError
+            If category is not registered.
+        ValueError
+            If the word list cannot be loaded.
+        """
+        try:
+            return self[category]
+        except ValueError:
+            self.unregister(category)
+            raise
+
+    def unregister(self, category: str) -> None:
+        """Remove category, if it is registered."""
+        self._loaders.pop(category, None)
+        self._loaded.pop(category, None)
+
+    def loader(self, category: str) -> Callable[[], Sequence[str]]:
+        """Return the function that loads the category's word list."""
+        return self._loaders[category][0]
+
+    def singular(self, category: str) -> str:
+        """Return the singular form of category without loading words."""
+        return self._loaders[category][1]
+
+    def __getitem__(self, category: str) -> Lexicon:
+        try:
+            return self._loaded[category]
+        except KeyError:
+            loader, singular = self._loaders[category]
+        start = perf_counter_ns() if METRICS.enabled else 0
+        lexicon = Lexicon(loader(), singular)
+        if start:
+            _LOAD_TIME.observe(perf_counter_ns() - start)
+        self._loaded[category] = lexicon
+        return lexicon
+
+    def __contains__(self, category: object) -> bool:
+        return category in self._loaders
+
+    def __iter__(self) -> Iterator[str]:
+        # A copy, as categories may be removed by word file reads.
+        return iter(tuple(self._loaders))
+
+    def __len__(self) -> int:
+        return len(self._loaders)
 
 
 def _get_word_list(category: str = 'animals') -> list[str]:
-    """Return a list of words."""
+    """Return a list of words without duplicates."""
     category = category.lower()
     try:
         words: str = _LEXICON_DICT[category]
-        return [word.upper() for word in words.split()]
+        return _unique(word.upper() for word in words.split())
     except KeyError as exc:
         raise ValueError("Invalid category.") from exc
 
 
+# System dictionary categories: (min length, max length, singular).
+_SYSTEM_CATEGORIES = {
+    'short words': (3, 5, 'a short word'),
+    'medium length words': (5, 8, 'a medium length word'),
+    'long words': (8, 50, 'a long word'),
+}
+
+_BUILTIN_CATEGORIES = {
+    'animals': 'an animal',
+    'dinosaurs': 'a dinosaur',
+    'flowers': 'a flower',
+    'trees': 'a tree',
+    'countries': 'a country',
+    'hard words': 'a hard word',
+}
+
+
+@cache
+def _system_index() -> LengthIndex:
+    """Return (cached) index of the system dictionary words."""
+    lang_dict = find_system_dictionary()
+    if lang_dict is None:
+        return LengthIndex(())
+    return load_cached('system', (lang_dict,), _CACHE_VERSION,
+                       lambda: LengthIndex(get_system_dictionary() or ()))
+
+
+@cache
+def _builtin_categories() -> dict[str, WordStore]:
+    """Return (cached) word lists of the built-in categories."""
+    return load_cached(
+        'builtin', (Path(__file__),), _CACHE_VERSION,
+        lambda: {cat: WordStore(_get_word_list(cat))
+                 for cat in _BUILTIN_CATEGORIES})
+
+
+def _system_loader(min_length: int,
+                   max_length: int) -> Callable[[], Sequence[str]]:
+    """Return loader for system dictionary words in length range."""
+    return lambda: _system_index().words(min_length, max_length)
+
+
+def _builtin_loader(category: str) -> Callable[[], Sequence[str]]:
+    """Return loader for one of the built-in categories."""
+    return lambda: _builtin_categories()[category]
+
+
+def add_length_category(min_length: int, max_length: int) -> str:
+    """Add a category of system dictionary words in a length range.
+
+    Returns
+    -------
+    str
+        The name of the new category.
+
+    Raises
+    ------
+    ValueError
+        If the range is invalid or there is no system dictionary.
+    """
+    if not 0 < min_length <= max_length:
+        raise ValueError(f"Invalid word length range "
+                         f"{min_length}-{max_length}.")
+    if find_system_dictionary() is None:
+        raise ValueError("No system dictionary found.")
+    category = f'{min_length} to {max_length} letter words'
+    lexicon_dict.register(category, _system_loader(min_length, max_length),
+                          singular=f'a {min_length} to {max_length} '
+                                   f'letter word')
+    return category
+
+
+def add_file_category(file_name: Path) -> str:
+    """Add a category of words read on demand from file_name.
+
+    The category is named after the file, without its extension.
+
+    Returns
+    -------
+    str
+        The name of the new category.
+
+    Raises
+    ------
+    ValueError
+        If file_name is not a file.
+    """
+    if not file_name.is_file():
+        raise ValueError(f"{file_name} is not a file.")
+    category = file_name.stem.replace('_', ' ').lower()
+    lexicon_dict.register(category,
+                          lambda: MappedWordList(
+                              file_name, _detect_file_encoding(file_name)),
+                          singular=f'a word from {category}')
+    return category
+
+
+def read_word_file(file_name: Path,
+                   min_len: int = 3) -> tuple[WordStore, ScanStats]:
+    """Return the valid words in a plain or compressed word list file,
+    and statistics.
+
+    The file is decompressed and validated as a stream (see
+    scan_word_stream). Lines that are not a single word of at least
+    min_len letters are skipped.
+    """
+    words, stats = scan_word_file(file_name, min_len)
+    return WordStore(_unique(words)), stats
+
+
+def _load_word_file(file_name: Path) -> tuple[WordStore, ScanStats]:
+    """Return (cached) words from word list file, and statistics.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be read or decompressed.
+    """
+    import lzma
+    import zlib
+    try:
+        return load_cached(cache_name('words', file_name), (file_name,),
+                           _CACHE_VERSION, lambda: read_word_file(file_name))
+    except (OSError, EOFError, lzma.LZMAError, zlib.error) as exc:
+        raise ValueError(f"Unable to read {file_name}: {exc}") from exc
+
+
+# Finished reads, appended by the thread pool.
+_word_file_reports: deque[WordFileReport] = deque()
+
+
+def _word_file_words(
+        future: 'Future[tuple[WordStore, ScanStats]]') -> WordStore:
+    """Return the words of a word list file read, waiting if need be."""
+    return future.result()[0]
+
+
+def _report_word_file(category: str, file_name: Path,
+                      future: 'Future[tuple[WordStore, ScanStats]]') -> None:
+    """Report a finished read, dropping the category if it is unusable."""
+    stats = None
+    try:
+        words, stats = future.result()
+        error = '' if words else f"No valid words in {file_name}"
+    except ValueError as exc:
+        error = str(exc)
+    if error:
+        lexicon_dict.unregister(category)
+    _word_file_reports.append(
+        WordFileReport(category, file_name, stats, error))
+
+
+def word_file_reports() -> list[WordFileReport]:
+    """Return the reads by add_word_directory() finished since last called.
+    """
+    reports = []
+    while True:
+        try:
+            reports.append(_word_file_reports.popleft())
+        except IndexError:
+            return reports
+
+
+@cache
+def _word_file_executor() -> 'Executor':
+    """Return the thread pool used to read word list files."""
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(thread_name_prefix='word-files')
+
+
+def add_word_directory(directory: Path) -> list[str]:
+    """Add a category for each word list file in directory.
+
+    Files with the extensions .txt, .gz and .xz are read. Each category
+    is named after its file, without extensions. Reading starts
+    immediately on a thread pool, so this returns without waiting for
+    the files to be read. A category whose file cannot be read, or has
+    no valid words, is removed when its read finishes. Finished reads
+    are returned by word_file_reports().
+
+    Returns
+    -------
+    list[str]
+        The names of the new categories.
+
+    Raises
+    ------
+    ValueError
+        If directory is not a directory.
+    """
+    if not directory.is_dir():
+        raise ValueError(f"{directory} is not a directory.")
+    categories = []
+    for file_name in sorted(directory.iterdir()):
+        if (file_name.suffix not in _WORD_FILE_EXTENSIONS or
+                not file_name.is_file()):
+            continue
+        category = file_name.name.split('.')[0].replace('_', ' ').lower()
+        future = _word_file_executor().submit(_load_word_file, file_name)
+        lexicon_dict.register(category, partial(_word_file_words, future),
+                              singular=f'a word from {category}')
+        future.add_done_callback(
+            partial(_report_word_file, category, file_name))
+        categories.append(category)
+    return categories
+
+
+@cache
+def get_pattern_index(category: str) -> PatternIndex:
+    """Return (cached) pattern index of the category's word list."""
+    return PatternIndex(lexicon_dict.load(category).word_list)
+
+
+lexicon_dict = LexiconDict()
+
+# System dictionary words. Only the file's existence is checked here.
+if find_system_dictionary() is not None:
+    for _category, (_min, _max, _singular) in _SYSTEM_CATEGORIES.items():
+        lexicon_dict.register(_category, _system_loader(_min, _max),
+                              singular=_singular)
+
 # Category words
-lexicon_dict.update({
-    'animals': Lexicon(word_list=_get_word_list('animals'),
-                       singular='an animal'),
-    'dinosaurs': Lexicon(word_list=_get_word_list('dinosaurs'),
-                         singular='a dinosaur'),
-    'flowers': Lexicon(word_list=_get_word_list('flowers'),
-                       singular='a flower'),
-    'trees': Lexicon(word_list=_get_word_list('trees'),
-                     singular='a tree'),
-    'countries': Lexicon(word_list=_get_word_list('countries'),
-                         singular='a country'),
-    'hard words': Lexicon(word_list=_get_word_list('hard words'),
-                          singular='a hard word'),
-})
+for _category, _singular in _BUILTIN_CATEGORIES.items():
+    lexicon_dict.register(_category, _builtin_loader(_category),
+                          singular=_singular)
 
 
 HELP_TEXT = """
@@ -234,7 +733,8 @@ How to Play
 4. Make guesses one letter at a time to guess
    the secret word.
 5. If you think that you know the word, you may
-   guess the entire word.
+   guess the entire word. In the terminal, press '='
+   first, and Enter after the word.
 6. Each time you guess a letter, all occurrences
    of that letter in the word will be shown.
 7. If your guess is incorrect, a part of the hangman
@@ -242,4 +742,5 @@ How to Play
 8. Continue guessing letters to reveal the entire word.
 9. You may quit at any time by pressing "Ctrl + C".
 10.To view the help menu, enter a question mark '?'.
+11.For a hint, enter an exclamation mark '!'.
 """
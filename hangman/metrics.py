@@ -0,0 +1,195 @@
+"""Counters and latency histograms for Hangman-CLI game.
+
+Instrumented code registers its metrics once, at import, and records
+them only when METRICS.enabled is true:
+
+    _LOAD_TIME = METRICS.histogram('lexicon.load')
+    ...
+    if METRICS.enabled:
+        start = perf_counter_ns()
+        ...
+        _LOAD_TIME.observe(perf_counter_ns() - start)
+
+so that when metrics are disabled, which is the default, the cost is a
+single attribute test.
+
+Histograms have fixed buckets (BUCKETS_NS), so recording a value never
+allocates, and percentiles are reported as the upper bound of the bucket
+that holds them.
+"""
+
+import json
+import sys
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from time import time
+from typing import TextIO
+
+# Upper bounds (in nanoseconds) of the histogram buckets, 250 ns to 4 s.
+BUCKETS_NS = tuple(250 * 2 ** n for n in range(25))
+
+# Default seconds between snapshots written by write_periodically().
+WRITE_INTERVAL = 10.0
+
+
+class Counter:
+    """A count of events."""
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Add amount to the count."""
+        self.value += amount
+
+
+class Histogram:
+    """Distribution of latencies, in BUCKETS_NS buckets.
+
+    Attributes
+    ----------
+    counts : list[int]
+        Number of values in each bucket. The last entry counts values
+        larger than every bucket.
+    count : int
+        Number of values.
+    total_ns : int
+        Sum of the values.
+    max_ns : int
+        Largest value.
+    """
+
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, value_ns: int) -> None:
+        """Record one latency, in nanoseconds."""
+        self.counts[bisect_left(BUCKETS_NS, value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        self.max_ns = max(self.max_ns, value_ns)
+
+    def percentile(self, percent: float) -> int:
+        """Return upper bound (ns) of the bucket holding the percentile."""
+        target = self.count * percent / 100
+        running = 0
+        for bound, count in zip(BUCKETS_NS, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return self.max_ns
+
+    def summary(self) -> dict[str, float]:
+        """Return count, mean, percentiles and maximum, in microseconds."""
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count,
+                'mean_us': self.total_ns / self.count / 1000,
+                'p50_us': self.percentile(50) / 1000,
+                'p90_us': self.percentile(90) / 1000,
+                'p99_us': self.percentile(99) / 1000,
+                'max_us': self.max_ns / 1000}
+
+
+class Metrics:
+    """Registry of named counters and histograms.
+
+    Attributes
+    ----------
+    enabled : bool
+        True if instrumented code should record metrics.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._counters: dict[str, Counter] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def counter(self, name: str) -> Counter:
+        """Return the counter called name, creating it if new."""
+        return self._counters.setdefault(name, Counter())
+
+    def histogram(self, name: str) -> Histogram:
+        """Return the histogram called name, creating it if new."""
+        return self._histograms.setdefault(name, Histogram())
+
+    def snapshot(self) -> dict:
+        """Return the current values, ready for JSON."""
+        return {
+            'time': time(),
+            'counters': {name: counter.value for name, counter
+                         in sorted(self._counters.items())},
+            'histograms': {name: histogram.summary() for name, histogram
+                           in sorted(self._histograms.items())},
+        }
+
+    def format_summary(self) -> str:
+        """Return printable summary of metrics that have been recorded."""
+        lines = ["Metrics (µs, bucket upper bound):"]
+        for name, counter in sorted(self._counters.items()):
+            if counter.value:
+                lines.append(f"  {name:<24}{counter.value:>12,}")
+        for name, histogram in sorted(self._histograms.items()):
+            if histogram.count:
+                stats = histogram.summary()
+                lines.append(f"  {name:<24}{histogram.count:>12,}  "
+                             f"mean: {stats['mean_us']:.2f}  "
+                             f"p50: {stats['p50_us']:.2f}  "
+                             f"p99: {stats['p99_us']:.2f}  "
+                             f"max: {stats['max_us']:.2f}")
+        return '\n'.join(lines)
+
+    def write_json(self, stream: TextIO) -> None:
+        """Write a snapshot as one line of JSON."""
+        stream.write(json.dumps(self.snapshot()) + '\n')
+        stream.flush()
+
+    def write_periodically(self, path: Path,
+                           interval: float = WRITE_INTERVAL) -> None:
+        """Append a JSON snapshot to path every interval seconds.
+
+        Writing continues in a daemon thread until stop() is called,
+        which also writes a final snapshot.
+
+        Raises
+        ------
+        OSError
+            If path cannot be opened.
+        """
+        # pylint: disable-next=consider-using-with
+        stream = open(path, 'a', encoding='utf-8')
+
+        def run() -> None:
+            with stream:
+                while not self._stop.wait(interval):
+                    self.write_json(stream)
+                self.write_json(stream)
+
+        self._thread = threading.Thread(target=run, daemon=True,
+                                        name='metrics')
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop periodic writing, after a final snapshot."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def dump(self, stream: TextIO = sys.stderr) -> None:
+        """Print the summary to stream."""
+        print(self.format_summary(), file=stream)
+
+
+METRICS = Metrics()
+"""The metrics of this process."""
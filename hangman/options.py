@@ -0,0 +1,129 @@
+"""Command line options for Hangman-CLI game."""
+
+import argparse
+from pathlib import Path
+
+from difficulty import TIERS
+from metrics import WRITE_INTERVAL
+from terminal import SPEED_PROFILES, parse_speed
+
+
+def length_range(value: str) -> tuple[int, int]:
+    """Parse a 'MIN-MAX' word length range command line argument."""
+    try:
+        min_len, max_len = (int(val) for val in value.split('-'))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"'{value}' is not a range such as 6-9") from exc
+    return min_len, max_len
+
+
+def positive_int(value: str) -> int:
+    """Parse a command line argument that is a whole number above 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"'{value}' is not a whole number above 0")
+    return number
+
+
+def speed_arg(value: str) -> float:
+    """Parse a --speed command line argument."""
+    try:
+        return parse_speed(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"'{value}' is not a valid speed") from exc
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Return parsed command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="The classic word game as a CLI app.")
+    parser.add_argument('--length', type=length_range, metavar='MIN-MAX',
+                        help="add a category of dictionary words with "
+                             "MIN to MAX letters, e.g. 6-9")
+    parser.add_argument('--words', type=Path, metavar='FILE',
+                        help="add a category of words from FILE, "
+                             "one word per line")
+    parser.add_argument('--word-dir', type=Path, metavar='DIR',
+                        help="add a category for each .txt, .gz or .xz "
+                             "word list file in DIR")
+    parser.add_argument('--auto', action='store_true',
+                        help="watch the computer play")
+    parser.add_argument('--difficulty', choices=TIERS,
+                        help="only use words of this difficulty")
+    parser.add_argument('--score-words', action='store_true',
+                        help="score the difficulty of every word in every "
+                             "category, and report the average score")
+    parser.add_argument('--speed', type=speed_arg, default='normal',
+                        help="text speed: "
+                        + ", ".join(f"'{name}'" for name in SPEED_PROFILES)
+                        + ", or a number such as 2 for twice the normal "
+                        "speed (default: normal)")
+    parser.add_argument('--frames', type=Path, metavar='FILE',
+                        help="load the hangman drawings from FILE, with "
+                             "frames separated by lines of '%%%%'")
+    parser.add_argument('--lives', type=int, metavar='N',
+                        help="number of wrong guesses allowed "
+                             "(default: one less than the number of frames)")
+    parser.add_argument('--speedrun', action='store_true',
+                        help="time each game, with a timer on screen")
+    parser.add_argument('--evil', action='store_true',
+                        help="the computer avoids committing to a word, "
+                             "to make each guess as unlikely as it can")
+    parser.add_argument('--seed', type=int,
+                        help="random seed, so that the same secret words "
+                             "are chosen in the same order (default: 0 "
+                             "for simulated games, otherwise random)")
+    parser.add_argument('--no-journal', action='store_true',
+                        help="do not save finished games")
+    board = parser.add_argument_group('leaderboard')
+    board.add_argument('--leaderboard', nargs='?', const='',
+                       metavar='CATEGORY',
+                       help="show the players with the most wins, in all "
+                            "categories or in CATEGORY")
+    board.add_argument('--top', type=positive_int, default=10, metavar='N',
+                       help="number of players on the leaderboard "
+                            "(default: 10)")
+    board.add_argument('--days', type=positive_int, metavar='N',
+                       help="only count games from the last N days")
+    recording = parser.add_argument_group('recording')
+    recording.add_argument('--record', type=Path, metavar='FILE',
+                           help="add the games played to recording FILE")
+    recording.add_argument('--replay', type=Path, metavar='FILE',
+                           help="show the games in recording FILE, at the "
+                                "speed set by --speed")
+    recording.add_argument('--validate', action='store_true',
+                           help="with --replay, check that each game has "
+                                "the recorded result, without showing it")
+    monitoring = parser.add_argument_group('metrics')
+    monitoring.add_argument('--metrics', action='store_true',
+                            help="print counters and timings on exit")
+    monitoring.add_argument('--metrics-file', type=Path, metavar='FILE',
+                            help="append counters and timings to FILE as "
+                                 "JSON lines, every "
+                                 f"{WRITE_INTERVAL:g} seconds and on exit")
+    server = parser.add_argument_group('server')
+    server.add_argument('--serve', type=int, metavar='PORT',
+                        help="host games for network clients on PORT")
+    server.add_argument('--host', default='127.0.0.1',
+                        help="address to listen on (default: 127.0.0.1)")
+    simulation = parser.add_argument_group('simulation')
+    simulation.add_argument('--simulate', type=positive_int, metavar='N',
+                            help="play N games without any display, and "
+                                 "report the speed and win rate")
+    simulation.add_argument('--category', default='animals',
+                            help="category of words to simulate "
+                                 "(default: animals)")
+    simulation.add_argument('--strategy', choices=('solver', 'random'),
+                            default='solver',
+                            help="how simulated games guess "
+                                 "(default: solver)")
+    simulation.add_argument('--workers', type=positive_int,
+                            help="number of processes for simulated games "
+                                 "(default: number of CPUs)")
+    return parser.parse_args(argv)
@@ -0,0 +1,159 @@
+"""Positional pattern index for Hangman-CLI game.
+
+A PatternIndex answers the question "which words fit this partly revealed
+puzzle?" without scanning the word list. Words are grouped by length, and
+for each group the index holds a bitset (a Python int, where bit i stands
+for word i of the group) for every letter at every position, and for every
+letter anywhere in the word. A query is then a few bitset intersections.
+
+Patterns are strings with '_' for each letter that has not been revealed,
+for example 'A__LE'.
+"""
+
+from collections.abc import Iterable
+from random import Random
+
+UNKNOWN = '_'
+"""Placeholder for an unrevealed letter in a pattern."""
+
+
+def _bitset(indices: Iterable[int], size: int) -> int:
+    """Return int with the bits at indices set."""
+    data = bytearray((size + 7) // 8)
+    for idx in indices:
+        data[idx >> 3] |= 1 << (idx & 7)
+    return int.from_bytes(data, 'little')
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Yield the index of each set bit, lowest first."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_idx, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield byte_idx * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def wrong_letters(pattern: str, guesses: Iterable[str]) -> set[str]:
+    """Return the letters guessed that are not in the puzzle pattern."""
+    return {guess for guess in guesses
+            if len(guess) == 1 and guess not in pattern}
+
+
+def nth_bit(bits: int, n: int) -> int:
+    """Return the index of the n-th (from 0) set bit of bits."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_idx, byte in enumerate(data):
+        count = byte.bit_count()
+        if n < count:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    if n == 0:
+                        return byte_idx * 8 + bit
+                    n -= 1
+        n -= count
+    raise IndexError("Not enough set bits.")
+
+
+class LengthGroup:
+    """Bitsets for the words of one length.
+
+    Attributes
+    ----------
+    words : list[str]
+        The words. Bit i of each bitset stands for words[i].
+    all_words : int
+        Bitset with a bit set for every word.
+    at_position : list[dict[str, int]]
+        at_position[p][letter] is the bitset of words with letter at
+        position p.
+    contains : dict[str, int]
+        contains[letter] is the bitset of words that contain letter.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, words: list[str]) -> None:
+        self.words = words
+        size = len(words)
+        self.all_words = (1 << size) - 1
+        length = len(words[0]) if words else 0
+        positions: list[dict[str, list[int]]] = [{} for _ in range(length)]
+        for idx, word in enumerate(words):
+            for pos, letter in enumerate(word):
+                positions[pos].setdefault(letter, []).append(idx)
+        self.at_position = [{letter: _bitset(indices, size)
+                             for letter, indices in position.items()}
+                            for position in positions]
+        self.contains: dict[str, int] = {}
+        for position in self.at_position:
+            for letter, bits in position.items():
+                self.contains[letter] = self.contains.get(letter, 0) | bits
+
+
+class PatternIndex:
+    """Index of a word list by letter position."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        grouped: dict[int, list[str]] = {}
+        for word in words:
+            grouped.setdefault(len(word), []).append(word)
+        self._groups = {length: LengthGroup(group)
+                        for length, group in grouped.items()}
+
+    def group(self, length: int) -> LengthGroup | None:
+        """Return the words of length, or None if there are none."""
+        return self._groups.get(length)
+
+    def matches(self, pattern: str, excluded: Iterable[str] = ()) -> int:
+        """Return bitset of the words that fit pattern.
+
+        A word fits if it has each revealed letter at exactly the revealed
+        positions (as all occurrences of a letter are revealed together),
+        and contains none of the excluded letters.
+
+        Parameters
+        ----------
+        pattern: str
+            The puzzle, with UNKNOWN for each unrevealed letter.
+        excluded: Iterable[str]
+            Letters known not to be in the word.
+        """
+        group = self._groups.get(len(pattern))
+        if group is None:
+            return 0
+        bits = group.all_words
+        revealed = set(pattern) - {UNKNOWN}
+        for pos, char in enumerate(pattern):
+            position = group.at_position[pos]
+            if char == UNKNOWN:
+                for letter in revealed:
+                    bits &= ~position.get(letter, 0)
+            else:
+                bits &= position.get(char, 0)
+        for letter in excluded:
+            bits &= ~group.contains.get(letter, 0)
+        return bits
+
+    def count(self, pattern: str, excluded: Iterable[str] = ()) -> int:
+        """Return number of words that fit pattern."""
+        return self.matches(pattern, excluded).bit_count()
+
+    def candidates(self, pattern: str,
+                   excluded: Iterable[str] = ()) -> list[str]:
+        """Return list of the words that fit pattern."""
+        group = self._groups.get(len(pattern))
+        if group is None:
+            return []
+        return [group.words[idx]
+                for idx in iter_bits(self.matches(pattern, excluded))]
+
+    def suggest(self, pattern: str, excluded: Iterable[str] = (),
+                rng: Random | None = None) -> str | None:
+        """Return a random word that fits pattern, or None."""
+        bits = self.matches(pattern, excluded)
+        count = bits.bit_count()
+        if not count:
+            return None
+        group = self._groups[len(pattern)]
+        return group.words[nth_bit(bits, (rng or Random()).randrange(count))]
@@ -0,0 +1,337 @@
+"""Compact binary recordings of games for Hangman-CLI game.
+
+A recording file starts with MAGIC, followed by a stream of entries.
+Each entry is a tag byte and its fields. Integers are unsigned LEB128
+varints, and signed integers are zigzag encoded first.
+
+- TAG_SEGMENT: clears the string table. Written each time a Recorder
+  opens the file, so that recordings can be appended to.
+- TAG_STRING: varint length and UTF-8 bytes. Strings are numbered from
+  0 in the order they are defined within a segment.
+- TAG_GAME: signed start time in milliseconds (relative to the previous
+  game of the segment, absolute for the first), player, category and word
+  as string numbers, lives, won (0 or 1), number of guesses, then for
+  each guess its code and the milliseconds since the previous guess (or
+  the start of the game).
+
+A guess code below 26 is a letter A to Z, otherwise it is 26 plus the
+string number of the guess (a whole word guess).
+"""
+
+import mmap
+import string
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from types import TracebackType
+from typing import BinaryIO
+
+from engine import GameEngine, GameRecord
+
+MAGIC = b'HGREC\x01'
+TAG_SEGMENT = 0
+TAG_STRING = 1
+TAG_GAME = 2
+
+_LETTERS = string.ascii_uppercase
+_LETTER_CODES = {letter: code for code, letter in enumerate(_LETTERS)}
+
+
+class RecordingError(ValueError):
+    """A recording file is not valid."""
+
+
+@dataclass(slots=True)
+class RecordedGame:
+    """A game read from a recording.
+
+    Attributes
+    ----------
+    started : float
+        When the game started, in seconds since the epoch.
+    player : str
+        The player's name.
+    category : str
+        Category of the word.
+    word : str
+        The secret word.
+    lives : int
+        Number of wrong guesses that lost the game.
+    won : bool
+        True if the player won.
+    guesses : tuple[str, ...]
+        Guesses played, in order.
+    delays : tuple[float, ...]
+        Seconds before each guess, since the previous guess or the start.
+    """
+    # pylint: disable=too-many-instance-attributes
+    started: float
+    player: str
+    category: str
+    word: str
+    lives: int
+    won: bool
+    guesses: tuple[str, ...]
+    delays: tuple[float, ...]
+
+
+def encode_varint(value: int) -> bytes:
+    """Return value, a non-negative integer, as a varint."""
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def zigzag(value: int) -> int:
+    """Return signed value mapped to a non-negative integer."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    """Inverse of zigzag()."""
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Recorder:
+    """Writes finished games to a recording file.
+
+    Use as a context manager, or call close(), so that buffered games
+    are written.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open path for appending, starting a new segment.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be opened.
+        """
+        # pylint: disable-next=consider-using-with
+        self._file: BinaryIO = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._file.write(bytes((TAG_SEGMENT,)))
+        self._strings: dict[str, int] = {}
+        self._last_start = 0
+
+    def _string(self, text: str, out: bytearray) -> int:
+        """Return number of text, adding its definition to out if new."""
+        number = self._strings.get(text)
+        if number is None:
+            number = self._strings[text] = len(self._strings)
+            data = text.encode('utf-8')
+            out.append(TAG_STRING)
+            out += encode_varint(len(data))
+            out += data
+        return number
+
+    def record(self, record: GameRecord) -> None:
+        """Add a finished game.
+
+        Suitable as a GameEngine listener.
+        """
+        out = bytearray()
+        player = self._string(record.player, out)
+        category = self._string(record.category, out)
+        word = self._string(record.word, out)
+        codes = []
+        for guess in record.guesses:
+            code = _LETTER_CODES.get(guess)
+            if code is None:
+                code = len(_LETTERS) + self._string(guess, out)
+            codes.append(code)
+        start = round(record.started * 1000)
+        out.append(TAG_GAME)
+        out += encode_varint(zigzag(start - self._last_start))
+        self._last_start = start
+        for value in (player, category, word, record.lives,
+                      int(record.won), len(codes)):
+            out += encode_varint(value)
+        previous = 0.0
+        for code, when in zip(codes, record.guess_times):
+            out += encode_varint(code)
+            out += encode_varint(max(0, round((when - previous) * 1000)))
+            previous = when
+        self._file.write(out)
+
+    def close(self) -> None:
+        """Close the recording."""
+        self._file.close()
+
+    def __enter__(self) -> 'Recorder':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+
+def read_games(path: Path) -> Iterator[RecordedGame]:
+    """Yield each game in a recording file, oldest first.
+
+    Raises
+    ------
+    RecordingError
+        If the file is not a recording, or is corrupt. A game cut short
+        at the end of the file is ignored.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise RecordingError(f"{path} is not a game recording.")
+        if file.seek(0, 2) == len(MAGIC):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _parse(data, len(MAGIC))
+
+
+def _parse(data: mmap.mmap, pos: int) -> Iterator[RecordedGame]:
+    """Yield the games in data, from pos."""
+    # pylint: disable=too-many-locals
+    size = len(data)
+    strings: list[str] = []
+    last_start = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = data[pos]
+        pos += 1
+        if value < 0x80:
+            return value
+        result = value & 0x7f
+        shift = 7
+        while True:
+            value = data[pos]
+            pos += 1
+            result |= (value & 0x7f) << shift
+            if value < 0x80:
+                return result
+            shift += 7
+
+    try:
+        while pos < size:
+            tag = data[pos]
+            pos += 1
+            if tag == TAG_GAME:
+                game_pos = pos - 1
+                last_start += unzigzag(varint())
+                player, category, word, lives, won, count = (
+                    varint(), varint(), varint(), varint(), varint(),
+                    varint())
+                guesses = []
+                delays = []
+                for _ in range(count):
+                    code = varint()
+                    if code - len(_LETTERS) >= len(strings):
+                        raise RecordingError(
+                            f"Corrupt game at byte {game_pos}.")
+                    guesses.append(_LETTERS[code] if code < len(_LETTERS)
+                                   else strings[code - len(_LETTERS)])
+                    delays.append(varint() / 1000)
+                if (lives < 1 or
+                        max(player, category, word) >= len(strings) or
+                        not strings[word]):
+                    raise RecordingError(f"Corrupt game at byte {game_pos}.")
+                yield RecordedGame(last_start / 1000, strings[player],
+                                   strings[category], strings[word], lives,
+                                   bool(won), tuple(guesses), tuple(delays))
+            elif tag == TAG_STRING:
+                length = varint()
+                if pos + length > size:
+                    return
+                strings.append(data[pos:pos + length].decode('utf-8'))
+                pos += length
+            elif tag == TAG_SEGMENT:
+                strings = []
+                last_start = 0
+            else:
+                raise RecordingError(f"Unknown tag {tag} at byte {pos - 1}.")
+    except IndexError as exc:
+        if pos < size:
+            raise RecordingError(f"Corrupt recording at byte {pos}.") from exc
+    except UnicodeDecodeError as exc:
+        raise RecordingError(f"Corrupt recording at byte {pos}.") from exc
+
+
+@dataclass
+class ValidationResult:
+    """Results of replaying recorded games against the current rules.
+
+    Attributes
+    ----------
+    games : int
+        Number of games replayed.
+    mismatches : int
+        Games whose outcome differs from the recording.
+    elapsed : float
+        Seconds taken to read and replay the games.
+    first_mismatches : list[RecordedGame]
+        The first few games whose outcome differs.
+    """
+    games: int = 0
+    mismatches: int = 0
+    elapsed: float = 0.0
+    first_mismatches: list[RecordedGame] = field(default_factory=list)
+
+
+def replay_outcome(engine: GameEngine, game: RecordedGame) -> bool | None:
+    """Replay game with engine and return True if won.
+
+    Returns None if the game is still in progress after the last guess,
+    or ends before it.
+    """
+    engine.lives = game.lives
+    engine.start(game.word)
+    guesses = game.guesses
+    for idx, guess in enumerate(guesses):
+        result = engine.guess(guess)
+        if result.is_over:
+            if idx != len(guesses) - 1:
+                return None
+            return engine.state.is_solved
+    return None
+
+
+def validate(games: Iterator[RecordedGame],
+             keep: int = 10) -> ValidationResult:
+    """Replay games without rendering, and count changed outcomes.
+
+    Parameters
+    ----------
+    games: Iterator[RecordedGame]
+        The recorded games.
+    keep: int
+        Number of mismatched games to keep in the result.
+    """
+    result = ValidationResult()
+    engine = GameEngine()
+    start = perf_counter()
+    for game in games:
+        result.games += 1
+        if replay_outcome(engine, game) is not game.won:
+            result.mismatches += 1
+            if result.mismatches <= keep:
+                result.first_mismatches.append(game)
+    result.elapsed = perf_counter() - start
+    return result
+
+
+def format_validation(result: ValidationResult) -> str:
+    """Return printable summary of validation results."""
+    rate = result.games / result.elapsed if result.elapsed else 0.0
+    lines = [f"Games:       {result.games:,}",
+             f"Elapsed:     {result.elapsed:.2f} s",
+             f"Throughput:  {rate:,.0f} games/s",
+             f"Mismatches:  {result.mismatches:,}"]
+    for game in result.first_mismatches:
+        lines.append(f"    {game.word} by {game.player}: recorded as "
+                     f"{'won' if game.won else 'lost'}, "
+                     f"guesses {' '.join(game.guesses)}")
+    return '\n'.join(lines)
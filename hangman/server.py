@@ -0,0 +1,355 @@
+"""Asyncio TCP server for Hangman-CLI game.
+
+Each connection plays its own games, with its own GameEngine, through a
+line protocol: every message from the server is a line of UTF-8 text, and
+the server waits for one line from the client after each of the PROMPTS.
+All connections share the word lists in lexicon_dict and one FrameSet.
+
+Sessions are coroutines rather than threads, so an idle connection costs
+little more than its socket buffers and a GameEngine. Reading and writing
+saved games, which can wait on the disk, is done on a single I/O thread,
+so that a slow write does not hold up every client, and the journal and
+leaderboard are only used by one thread at a time.
+"""
+
+import asyncio
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from ascii_art import FrameSet, default_frames
+from engine import GameEngine, GameRecord, Outcome
+from gamestate import get_secret_word
+from journal import Journal
+from leaderboard import Leaderboard
+from lexicon import get_pattern_index, lexicon_dict, HELP_TEXT
+
+NAME_PROMPT = "Hi there. What's your name?"
+CATEGORY_PROMPT = "Enter a number:"
+GUESS_PROMPT = "Guess a letter:"
+AGAIN_PROMPT = "Play again? [y/n]"
+PROMPTS = (NAME_PROMPT, CATEGORY_PROMPT, GUESS_PROMPT, AGAIN_PROMPT)
+"""Lines after which the server waits for the client's answer."""
+
+# Longest line accepted from a client, in bytes.
+MAX_LINE_LENGTH = 256
+
+# Connections waiting to be accepted, for bursts of new clients.
+BACKLOG = 1024
+
+# Seconds between writes of finished games that have not filled a batch.
+FLUSH_INTERVAL = 5.0
+
+# Seconds to wait for an answer before closing the connection.
+IDLE_TIMEOUT = 600.0
+
+
+class ClientGone(Exception):
+    """The client disconnected, timed out, or sent an overlong line."""
+
+
+class Session:
+    """One connection's games.
+
+    Attributes
+    ----------
+    engine : GameEngine
+        The rules of the game, and the score for this connection.
+    """
+
+    __slots__ = ('engine', '_reader', '_writer', '_frames', '_timeout',
+                 '_journal', '_io')
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter,
+                 frames: FrameSet,
+                 timeout: float = IDLE_TIMEOUT,
+                 journal: Journal | None = None, *,
+                 engine_class: type[GameEngine] = GameEngine,
+                 io: Executor | None = None) -> None:
+        """Initialise Session.
+
+        Parameters
+        ----------
+        reader: asyncio.StreamReader
+            Lines from the client.
+        writer: asyncio.StreamWriter
+            Lines to the client.
+        frames: FrameSet
+            Hangman drawings, shared by all sessions.
+        timeout: float
+            Seconds to wait for each answer.
+        journal: Journal | None
+            Where the player's saved score is read from, if anywhere.
+            Finished games are saved by the engine's listeners.
+        engine_class: type[GameEngine]
+            The rules, GameEngine or a subclass such as EvilEngine.
+        io: Executor | None
+            Where the journal is read, default: the event loop's default
+            executor.
+        """
+        self.engine = engine_class(frames.lives)
+        self._journal = journal
+        self._io = io
+        self._reader = reader
+        self._writer = writer
+        self._frames = frames
+        self._timeout = timeout
+
+    def send(self, text: str) -> None:
+        """Queue text, as one or more lines, to be sent to the client."""
+        self._writer.write(text.encode('utf-8') + b'\n')
+
+    async def ask(self, prompt: str) -> str:
+        """Send prompt and return the client's answer.
+
+        Raises
+        ------
+        ClientGone
+            If no answer is received.
+        """
+        self.send(prompt)
+        try:
+            await self._writer.drain()
+            line = await asyncio.wait_for(self._reader.readline(),
+                                          self._timeout)
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as exc:
+            raise ClientGone from exc
+        if not line:
+            raise ClientGone
+        return line.decode('utf-8', errors='replace').strip()
+
+    async def run(self) -> None:
+        """Play games until the client declines to play again."""
+        state = self.engine.state
+        state.player_name = (await self.ask(NAME_PROMPT)).title()
+        if self._journal:
+            self.engine.wins, self.engine.losses = (
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io, self._journal.score, state.player_name))
+        self.send(f"Hello {state.player_name}.\n"
+                  "Enter '?' to view help, or '!' for a hint.")
+        state.category = await self.choose_category()
+        while True:
+            try:
+                word = get_secret_word(state.category)
+            except RuntimeError as exc:
+                self.send(f"Sorry, there has been an error: {exc}")
+                break
+            self.engine.start(word)
+            singular = lexicon_dict[state.category].singular
+            self.send(f"I've thought of {singular}.\n"
+                      f"The word has {len(state.word)} letters.")
+            if await self.play_game():
+                self.send(f"Well done {state.player_name}. You got the "
+                          f"word {state.word} with "
+                          f"{self.engine.lives_left} guesses remaining.")
+            else:
+                self.send(f"Too bad {state.player_name}, you lose. "
+                          f"The word was {state.word}.")
+            state.reset_current_game()
+            if (await self.ask(AGAIN_PROMPT)).lower() not in ('y', 'yes'):
+                break
+        self.send(f"Bye {state.player_name}.")
+        await self._writer.drain()
+
+    async def choose_category(self) -> str:
+        """Return the category chosen by the client.
+
+        The first use of a category loads its words and builds the
+        pattern index used by hints, which can take a while for the
+        system dictionary, so it is done without holding up other
+        clients. A category that fails to load is reported and dropped.
+        """
+        categories = tuple(lexicon_dict.keys())
+        self.send("Select one of these categories:\n" + '\n'.join(
+            f"{idx + 1}. {cat.title()}"
+            for idx, cat in enumerate(categories)))
+        while True:
+            answer = await self.ask(CATEGORY_PROMPT)
+            try:
+                category = categories[int(answer) - 1]
+            except (ValueError, IndexError):
+                category = ''
+            if category not in lexicon_dict:
+                self.send(f"{answer} is not an option.")
+                continue
+            try:
+                await asyncio.to_thread(get_pattern_index, category)
+            except ValueError as exc:
+                self.send(f"Sorry, {category.title()} is not available. "
+                          f"{exc}.")
+                continue
+            return category
+
+    async def play_game(self) -> bool:
+        """Play one game, returning True if the client wins."""
+        self.send_frame()
+        while True:
+            guess = await self.ask(GUESS_PROMPT)
+            if guess == '?':
+                self.send(HELP_TEXT)
+                continue
+            if guess == '!':
+                self.send_hint()
+                continue
+            result = self.engine.guess(guess)
+            if result.outcome is Outcome.REPEATED:
+                self.send(f"You've already guessed '{result.guess}'")
+                continue
+            if result.outcome is Outcome.INVALID:
+                self.send("Guesses must be one letter or the whole "
+                          f"{len(self.engine.state.word)} letter word.")
+                continue
+            self.send_frame()
+            self.send(f"{result.guess} is {result.outcome.value}.")
+            if result.is_over:
+                return self.engine.state.is_solved
+
+    def send_frame(self) -> None:
+        """Send the score, the hangman drawing and the puzzle."""
+        engine = self.engine
+        state = engine.state
+        self.send(f"Won: {engine.wins}  Lost: {engine.losses}\n"
+                  f"{self._frames.text(state.image_idx)}\n"
+                  f"{' '.join(state.pattern)}")
+
+    def send_hint(self) -> None:
+        """Send the number of words that fit the puzzle, and a suggestion."""
+        state = self.engine.state
+        pattern = state.pattern
+        wrong_letters = state.wrong_letters
+        index = get_pattern_index(state.category)
+        self.send(f"{index.count(pattern, wrong_letters)} possible words fit.")
+        suggestion = index.suggest(pattern, wrong_letters)
+        if suggestion:
+            self.send(f"How about {suggestion}?")
+
+
+class HangmanServer:
+    """Server hosting one Session per connection.
+
+    Attributes
+    ----------
+    frames : FrameSet
+        Hangman drawings, shared by all sessions.
+    timeout : float
+        Seconds to wait for each answer.
+    connections : int
+        Number of open connections.
+    journal : Journal | None
+        Where finished games are saved, if anywhere.
+    leaderboard : Leaderboard | None
+        Where finished games are ranked, if anywhere.
+    listeners : list[Callable[[GameRecord], None]]
+        Other functions called with a GameRecord when a game ends.
+    engine_class : type[GameEngine]
+        The rules of each session's games.
+    io : Executor
+        The thread that reads and writes saved games.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(self, frames: FrameSet | None = None,
+                 timeout: float = IDLE_TIMEOUT,
+                 journal: Journal | None = None,
+                 leaderboard: Leaderboard | None = None,
+                 engine_class: type[GameEngine] = GameEngine) -> None:
+        """Initialise HangmanServer."""
+        self.frames = frames or default_frames()
+        self.engine_class = engine_class
+        self.timeout = timeout
+        self.connections = 0
+        self.journal = journal
+        self.leaderboard = leaderboard
+        self.listeners: list[Callable[[GameRecord], None]] = []
+        self.io: Executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='hangman-io')
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Play games with one client, then close the connection."""
+        self.connections += 1
+        try:
+            session = Session(reader, writer, self.frames, self.timeout,
+                              self.journal, engine_class=self.engine_class,
+                              io=self.io)
+            session.engine.listeners.extend(
+                partial(self._save, listener)
+                for listener in self._store_listeners())
+            await session.run()
+        except ClientGone:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _store_listeners(self) -> list[Callable[[GameRecord], None]]:
+        """Return every function to call with a finished game."""
+        stores = [store.record for store in (self.journal, self.leaderboard)
+                  if store]
+        return stores + self.listeners
+
+    def _save(self, listener: Callable[[GameRecord], None],
+              record: GameRecord) -> None:
+        """Call listener with record on the I/O thread, without waiting."""
+        self.io.submit(listener, record).add_done_callback(_report_failure)
+
+    def flush(self) -> None:
+        """Write finished games that are waiting for a full batch."""
+        if self.journal:
+            self.journal.flush()
+        if self.leaderboard:
+            self.leaderboard.flush()
+
+    def close(self) -> None:
+        """Wait for games queued on the I/O thread to be saved."""
+        self.io.shutdown()
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Start listening and return the asyncio server.
+
+        Port 0 chooses a free port.
+        """
+        return await asyncio.start_server(self.handle_client, host, port,
+                                          limit=MAX_LINE_LENGTH,
+                                          backlog=BACKLOG)
+
+
+async def serve(host: str, port: int,
+                hangman_server: HangmanServer | None = None) -> None:
+    """Serve Hangman games on host:port until cancelled."""
+    hangman_server = hangman_server or HangmanServer()
+    server = await hangman_server.start(host, port)
+    for sock in server.sockets:
+        host_name, port_number = sock.getsockname()[:2]
+        print(f"Serving Hangman on {host_name}:{port_number}", flush=True)
+    flusher = asyncio.create_task(flush_periodically(hangman_server))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        flusher.cancel()
+        hangman_server.close()
+
+
+async def flush_periodically(hangman_server: HangmanServer) -> None:
+    """Write finished games every FLUSH_INTERVAL seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await loop.run_in_executor(hangman_server.io, hangman_server.flush)
+
+
+def _report_failure(future: Future[Any]) -> None:
+    """Print the error of a failed save, as nobody waits for it."""
+    exc = future.exception()
+    if exc:
+        print(f"Unable to save a game: {exc}", file=sys.stderr)
@@ -0,0 +1,217 @@
+"""Headless simulation and throughput benchmark for Hangman-CLI game.
+
+Plays many complete games with a guessing strategy in place of the
+player, without any terminal I/O, and reports games per second, the win
+rate, and the latency of GameEngine.guess.
+
+Games are spread across a pool of worker processes. Each batch of games
+has its own random seed derived from the base seed, so results do not
+depend on the number of workers.
+"""
+
+import os
+import string
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from random import Random
+from time import perf_counter, perf_counter_ns
+from typing import Any
+
+from engine import GameEngine
+from lexicon import get_pattern_index, lexicon_dict
+from solver import FrequencySolver
+from wordsource import ShuffleBag
+
+Strategy = Callable[[str, set[str]], str]
+"""Function returning the next guess, given the pattern and guesses."""
+
+# Upper bounds (in nanoseconds) of the latency histogram buckets.
+LATENCY_BUCKETS_NS = tuple(250 * 2 ** n for n in range(16))
+
+# Number of batches per worker, to balance the load.
+_BATCHES_PER_WORKER = 4
+
+
+def solver_strategy(category: str, _rng: Random) -> Strategy:
+    """Return strategy that guesses with a FrequencySolver."""
+    return FrequencySolver(get_pattern_index(category)).next_guess
+
+
+def random_strategy(_category: str, rng: Random) -> Strategy:
+    """Return strategy that guesses random unguessed letters."""
+    def guess(_pattern: str, guesses: set[str]) -> str:
+        return rng.choice([letter for letter in string.ascii_uppercase
+                           if letter not in guesses])
+    return guess
+
+
+STRATEGIES: dict[str, Callable[[str, Random], Strategy]] = {
+    'solver': solver_strategy,
+    'random': random_strategy,
+}
+"""Strategy factories, by name."""
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Simulation settings.
+
+    Attributes
+    ----------
+    games : int
+        Number of games to play.
+    category : str
+        Category of words to play.
+    strategy : str
+        Key of STRATEGIES.
+    seed : int
+        Base random seed.
+    workers : int | None
+        Number of worker processes. Defaults to the number of CPUs.
+    """
+    games: int
+    category: str
+    strategy: str = 'solver'
+    seed: int = 0
+    workers: int | None = None
+
+
+@dataclass
+class SimulationResult:
+    """Combined results of simulated games.
+
+    Attributes
+    ----------
+    games : int
+        Number of games played.
+    wins : int
+        Number of games won.
+    guesses : int
+        Total number of guesses.
+    latency_counts : list[int]
+        Count of GameEngine.guess calls in each LATENCY_BUCKETS_NS
+        bucket. The last entry counts calls slower than every bucket.
+    max_latency_ns : int
+        Slowest GameEngine.guess call.
+    """
+    games: int = 0
+    wins: int = 0
+    guesses: int = 0
+    latency_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_NS) + 1))
+    max_latency_ns: int = 0
+
+    def add_latency(self, latency_ns: int) -> None:
+        """Record the latency of one GameEngine.guess call."""
+        for idx, bound in enumerate(LATENCY_BUCKETS_NS):
+            if latency_ns <= bound:
+                self.latency_counts[idx] += 1
+                break
+        else:
+            self.latency_counts[-1] += 1
+        self.max_latency_ns = max(self.max_latency_ns, latency_ns)
+
+    def merge(self, other: 'SimulationResult') -> None:
+        """Add the results of other to this result."""
+        self.games += other.games
+        self.wins += other.wins
+        self.guesses += other.guesses
+        self.latency_counts = [count + other_count for count, other_count
+                               in zip(self.latency_counts,
+                                      other.latency_counts)]
+        self.max_latency_ns = max(self.max_latency_ns, other.max_latency_ns)
+
+    def latency_percentile(self, percent: float) -> int:
+        """Return upper bound (ns) of the bucket holding the percentile."""
+        target = self.guesses * percent / 100
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS_NS, self.latency_counts):
+            running += count
+            if running >= target:
+                return bound
+        return self.max_latency_ns
+
+
+def play_headless(engine: GameEngine, word: str,
+                  strategy: Strategy, result: SimulationResult) -> None:
+    """Play one game of word with strategy, adding to result."""
+    engine.start(word)
+    state = engine.state
+    while True:
+        guess = strategy(state.pattern, state.guesses)
+        start = perf_counter_ns()
+        outcome = engine.guess(guess)
+        result.add_latency(perf_counter_ns() - start)
+        result.guesses += 1
+        if outcome.is_over:
+            break
+    result.games += 1
+    result.wins += state.is_solved
+
+
+def simulate_batch(category: str, strategy_name: str, games: int,
+                   seed: int) -> SimulationResult:
+    """Play a batch of games and return the results."""
+    rng = Random(seed)
+    words = lexicon_dict[category].word_list
+    strategy = STRATEGIES[strategy_name](category, rng)
+    engine = GameEngine()
+    engine.state.category = category
+    result = SimulationResult()
+    bag = ShuffleBag(words, rng)
+    for _ in range(games):
+        word = bag.draw()
+        play_headless(engine, word, strategy, result)
+    return result
+
+
+def run_simulation(config: SimulationConfig,
+                   initializer: Callable[..., Any] | None = None,
+                   initargs: tuple = ()) -> tuple[SimulationResult, float]:
+    """Play games across a process pool.
+
+    Parameters
+    ----------
+    config: SimulationConfig
+        Simulation settings.
+    initializer: Callable | None
+        Called with initargs in each worker before it plays, for example
+        to add categories given on the command line.
+    initargs: tuple
+        Arguments for initializer.
+
+    Returns
+    -------
+    tuple[SimulationResult, float]
+        The combined results, and the elapsed time in seconds.
+    """
+    workers = config.workers or os.cpu_count() or 1
+    batches = min(config.games, workers * _BATCHES_PER_WORKER) or 1
+    sizes = [config.games // batches + (idx < config.games % batches)
+             for idx in range(batches)]
+    result = SimulationResult()
+    start = perf_counter()
+    with ProcessPoolExecutor(workers, initializer=initializer,
+                             initargs=initargs) as executor:
+        futures = [executor.submit(simulate_batch, config.category,
+                                   config.strategy, size, config.seed + idx)
+                   for idx, size in enumerate(sizes)]
+        for future in futures:
+            result.merge(future.result())
+    return result, perf_counter() - start
+
+
+def format_report(result: SimulationResult, elapsed: float) -> str:
+    """Return printable summary of simulation results."""
+    win_rate = result.wins / result.games if result.games else 0.0
+    latencies = '  '.join(
+        f"p{pct}: {result.latency_percentile(pct) / 1000:.2f}"
+        for pct in (50, 90, 99))
+    return (f"Games:       {result.games:,}\n"
+            f"Elapsed:     {elapsed:.2f} s\n"
+            f"Throughput:  {result.games / elapsed:,.0f} games/s\n"
+            f"Win rate:    {win_rate:.1%}\n"
+            f"Guesses:     {result.guesses:,}\n"
+            f"GameEngine.guess latency (µs, bucket upper bound):\n"
+            f"    {latencies}  max: {result.max_latency_ns / 1000:.2f}")
@@ -0,0 +1,58 @@
+"""Automatic solver for Hangman-CLI game.
+
+FrequencySolver guesses the unguessed letter that appears in the most
+words that still fit the puzzle. Candidate filtering and letter counting
+are done on the bitsets of a PatternIndex, so each guess is a few big-int
+operations per letter rather than a loop over the words.
+"""
+
+from collections.abc import Iterable
+
+from patterns import PatternIndex, wrong_letters
+
+# Letters in order of frequency in English, used when no word fits.
+LETTER_FREQUENCY_ORDER = 'ETAOINSHRDLCUMWFGYPBVKJXQZ'
+
+
+class FrequencySolver:
+    """Guess the letter found in the most remaining candidate words."""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, index: PatternIndex) -> None:
+        """Initialise solver.
+
+        Parameters
+        ----------
+        index: PatternIndex
+            Index of the word list that the secret word is taken from.
+        """
+        self.index = index
+
+    def next_guess(self, pattern: str, guesses: Iterable[str]) -> str:
+        """Return the best guess for the puzzle.
+
+        If only one candidate word remains, the whole word is guessed.
+
+        Parameters
+        ----------
+        pattern: str
+            The puzzle, with patterns.UNKNOWN for each unrevealed letter.
+        guesses: Iterable[str]
+            All guesses made so far.
+        """
+        guessed = set(guesses)
+        candidates = self.index.matches(pattern,
+                                        wrong_letters(pattern, guessed))
+        group = self.index.group(len(pattern))
+        if group is None or not candidates:
+            return next(letter for letter in LETTER_FREQUENCY_ORDER
+                        if letter not in guessed)
+        if candidates.bit_count() == 1:
+            word = group.words[candidates.bit_length() - 1]
+            if word not in guessed:
+                return word
+        counts = {letter: (candidates & bits).bit_count()
+                  for letter, bits in group.contains.items()
+                  if letter not in guessed}
+        # Most frequent letter, alphabetical order breaks ties.
+        return min(counts, key=lambda letter: (-counts[letter], letter))
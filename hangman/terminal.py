@@ -0,0 +1,387 @@
+"""Terminal output for Hangman-CLI game.
+
+The Screen class writes each frame of the game to the terminal in a single
+write. On terminals that support ANSI escape sequences, the screen is
+cleared with escape sequences, and when a frame replaces the previous one,
+only the lines that have changed are redrawn. Other terminals fall back to
+running the system 'clear' (or 'cls') command.
+
+The Pacer class handles every deliberate delay in the game, such as
+printing text one character at a time. Delays are scaled by a speed
+profile, pressing a key skips the current animation, and when the game is
+not being played in a terminal there are no delays at all.
+
+The KeyReader class reads single key presses, without waiting for Enter,
+with a timeout so that the screen can be updated while waiting.
+"""
+
+import math
+import os
+import select
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+if sys.platform == 'win32':
+    import msvcrt  # pylint: disable=import-error
+else:
+    import termios
+    import tty
+
+CURSOR_HOME = '\x1b[H'
+CLEAR_SCREEN = '\x1b[2J'
+CLEAR_TO_END_OF_LINE = '\x1b[K'
+CLEAR_TO_END_OF_SCREEN = '\x1b[J'
+SAVE_CURSOR = '\x1b7'
+RESTORE_CURSOR = '\x1b8'
+
+
+def move_cursor(row: int, column: int = 1) -> str:
+    """Return escape sequence to move the cursor (1-based row, column)."""
+    return f'\x1b[{row};{column}H'
+
+
+def supports_ansi(stream: TextIO) -> bool:
+    """Return True if stream is a terminal that handles ANSI sequences."""
+    try:
+        if not stream.isatty():
+            return False
+    except (AttributeError, ValueError):
+        return False
+    if os.name == 'nt':
+        # Windows Terminal and ConEmu, or a Unix-like shell such as MSYS.
+        return any(var in os.environ
+                   for var in ('WT_SESSION', 'ConEmuANSI', 'TERM'))
+    return os.environ.get('TERM', 'dumb') != 'dumb'
+
+
+class Screen:
+    """Whole-frame terminal writer.
+
+    Attributes
+    ----------
+    stream : TextIO
+        The output stream.
+    ansi : bool
+        True if ANSI escape sequences are used.
+    """
+
+    def __init__(self, stream: TextIO | None = None,
+                 ansi: bool | None = None) -> None:
+        """Initialise Screen.
+
+        Parameters
+        ----------
+        stream: TextIO | None
+            Output stream, default: sys.stdout.
+        ansi: bool | None
+            Whether to use ANSI escape sequences, default: detected.
+        """
+        self.stream = stream or sys.stdout
+        self.ansi = supports_ansi(self.stream) if ansi is None else ansi
+        # Lines of the frame on screen, if it is still intact.
+        self._frame: list[str] | None = None
+
+    def clear(self) -> None:
+        """Clear the terminal.
+
+        Falls back to the system command if ANSI escape sequences are not
+        supported. This is disabled on Linux if not in a terminal.
+        """
+        self._frame = None
+        if self.ansi:
+            self.stream.write(CURSOR_HOME + CLEAR_SCREEN)
+            self.stream.flush()
+            return
+        if (sys.platform.startswith('linux') and
+                'TERM' not in os.environ):
+            return
+        self.stream.flush()
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+    def forget(self) -> None:
+        """Forget the frame on screen, so the next frame is drawn in full.
+
+        Call this after writing anything to the screen other than with
+        draw(), except below the frame.
+        """
+        self._frame = None
+
+    def draw(self, lines: list[str]) -> None:
+        """Replace the screen contents with lines, in one write.
+
+        If the previous frame is still on screen, only changed lines are
+        rewritten. Anything below the frame (such as messages and
+        prompts) is cleared, and the cursor is left below the frame.
+        """
+        if not self.ansi:
+            self.clear()
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+            return
+        if self._frame is None:
+            output = [CURSOR_HOME, CLEAR_SCREEN, '\n'.join(lines), '\n']
+        else:
+            output = [move_cursor(row) + line + CLEAR_TO_END_OF_LINE
+                      for row, line in enumerate(lines, 1)
+                      if row > len(self._frame) or
+                      self._frame[row - 1] != line]
+            output.append(move_cursor(len(lines) + 1) +
+                          CLEAR_TO_END_OF_SCREEN)
+        self.stream.write(''.join(output))
+        self.stream.flush()
+        self._frame = list(lines)
+
+    def write_at(self, row: int, column: int, text: str) -> None:
+        """Write text at (1-based) row and column, if ANSI is supported.
+
+        The cursor is left where it was, so this can be used while
+        waiting for input.
+        """
+        if self.ansi:
+            self.stream.write(SAVE_CURSOR + move_cursor(row, column) + text
+                              + RESTORE_CURSOR)
+            self.stream.flush()
+
+
+SPEED_PROFILES = {'instant': math.inf, 'normal': 1.0}
+"""Named speeds for Pacer. Higher is faster."""
+
+# Shortest time between writes when printing slowly, in seconds.
+FRAME_TIME = 1 / 60
+
+
+def parse_speed(value: str) -> float:
+    """Return speed for a profile name, or a number such as '2.5'.
+
+    Raises
+    ------
+    ValueError
+        If value is not a profile name or a positive number.
+    """
+    if value in SPEED_PROFILES:
+        return SPEED_PROFILES[value]
+    speed = float(value)
+    if math.isnan(speed) or speed <= 0:
+        raise ValueError("Speed must be greater than zero.")
+    return speed
+
+
+class Pacer:
+    """Scheduler for all deliberate delays.
+
+    Attributes
+    ----------
+    speed : float
+        Delays are divided by speed. math.inf means no delays.
+    stream : TextIO
+        Output stream for printing slowly.
+    """
+
+    def __init__(self, speed: float = 1.0,
+                 stream: TextIO | None = None,
+                 stdin: TextIO | None = None) -> None:
+        """Initialise Pacer.
+
+        If either stream or stdin is not a terminal, speed is set to
+        math.inf, so there are no delays.
+
+        Parameters
+        ----------
+        speed: float
+            Speed factor. See SPEED_PROFILES.
+        stream: TextIO | None
+            Output stream, default: sys.stdout.
+        stdin: TextIO | None
+            Input stream used to detect key presses, default: sys.stdin.
+        """
+        self.stream = stream or sys.stdout
+        self._stdin = stdin or sys.stdin
+        self.speed = speed if self._interactive() else math.inf
+        self._skipping = False
+        self._depth = 0
+
+    def _interactive(self) -> bool:
+        """Return True if both input and output are terminals."""
+        try:
+            return self._stdin.isatty() and self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    @contextmanager
+    def animation(self) -> Iterator[None]:
+        """Context in which a key press skips all remaining delays.
+
+        On Posix terminals, the terminal is put in cbreak mode so that a
+        single key press is detected without Enter.
+        """
+        self._depth += 1
+        saved = None
+        if (self._depth == 1 and self.speed != math.inf and
+                sys.platform != 'win32'):
+            try:
+                saved = termios.tcgetattr(self._stdin.fileno())
+                tty.setcbreak(self._stdin.fileno())
+            except (termios.error, ValueError, OSError):
+                saved = None
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if saved is not None:
+                termios.tcsetattr(self._stdin.fileno(),
+                                  termios.TCSADRAIN, saved)
+            if not self._depth:
+                self._skipping = False
+
+    def _key_pressed(self, timeout: float) -> bool:
+        """Wait up to timeout seconds, returning True if a key is pressed.
+
+        The key press is consumed.
+        """
+        if sys.platform == 'win32':
+            end = time.monotonic() + timeout
+            while time.monotonic() < end:
+                if msvcrt.kbhit():
+                    msvcrt.getwch()
+                    return True
+                time.sleep(min(0.01, max(0.0, end - time.monotonic())))
+            return False
+        try:
+            readable, _, _ = select.select([self._stdin], [], [], timeout)
+        except (ValueError, OSError):
+            time.sleep(timeout)
+            return False
+        if readable and self._depth:
+            os.read(self._stdin.fileno(), 64)
+            return True
+        if readable:
+            # Type-ahead outside an animation is left for input().
+            time.sleep(timeout)
+        return False
+
+    def sleep(self, seconds: float) -> None:
+        """Pause for seconds, scaled by speed.
+
+        Within an animation, a key press ends the pause and skips the
+        rest of the animation.
+        """
+        delay = seconds / self.speed
+        if delay <= 0 or self._skipping:
+            return
+        if self._key_pressed(delay) and self._depth:
+            self._skipping = True
+
+    def write_slowly(self, text: str, char_delay: float) -> None:
+        """Write text with char_delay seconds (before scaling) per character.
+
+        Characters are written in chunks, at most one chunk per
+        FRAME_TIME, rather than one write per character.
+        """
+        delay = char_delay / self.speed
+        if delay <= 0 or self._skipping:
+            self.stream.write(text)
+            self.stream.flush()
+            return
+        with self.animation():
+            chunk_size = max(1, math.ceil(FRAME_TIME / delay))
+            for start in range(0, len(text), chunk_size):
+                chunk = text[start:start + chunk_size]
+                self.sleep(len(chunk) * char_delay)
+                self.stream.write(chunk)
+                self.stream.flush()
+
+
+class KeyReader:
+    """Reader of single key presses.
+
+    Attributes
+    ----------
+    interactive : bool
+        True if input is a terminal, so keys can be read one at a time.
+        Otherwise, read whole lines with input().
+    """
+
+    def __init__(self, stdin: TextIO | None = None) -> None:
+        """Initialise KeyReader.
+
+        Parameters
+        ----------
+        stdin: TextIO | None
+            Input stream, default: sys.stdin.
+        """
+        self._stdin = stdin or sys.stdin
+        try:
+            self.interactive = self._stdin.isatty()
+        except (AttributeError, ValueError):
+            self.interactive = False
+        # Keys read from the terminal but not yet returned.
+        self._pending = ''
+
+    @contextmanager
+    def cbreak(self) -> Iterator[None]:
+        """Context in which keys are read as soon as they are pressed.
+
+        On Posix terminals, the terminal is put in cbreak mode, so keys
+        are not echoed, and Ctrl+C still raises KeyboardInterrupt.
+        """
+        saved = None
+        if self.interactive and sys.platform != 'win32':
+            try:
+                saved = termios.tcgetattr(self._stdin.fileno())
+                tty.setcbreak(self._stdin.fileno())
+            except (termios.error, ValueError, OSError):
+                saved = None
+        try:
+            yield
+        finally:
+            if saved is not None:
+                termios.tcsetattr(self._stdin.fileno(),
+                                  termios.TCSADRAIN, saved)
+
+    def read_key(self, timeout: float | None = None) -> str | None:
+        """Return the next key pressed, or None after timeout seconds.
+
+        Call within cbreak(). Keys that send escape sequences, such as
+        the arrow keys, are returned as the whole sequence.
+
+        Raises
+        ------
+        EOFError
+            If input has ended, or Ctrl+D (Ctrl+Z on Windows) is pressed.
+        """
+        if not self._pending:
+            self._pending = self._read(timeout)
+            if not self._pending:
+                return None
+        if self._pending[0] == '\x1b':
+            key, self._pending = self._pending, ''
+        else:
+            key, self._pending = self._pending[0], self._pending[1:]
+        if key in ('\x04', '\x1a'):
+            raise EOFError
+        return key
+
+    def _read(self, timeout: float | None) -> str:
+        """Return the keys pressed, waiting up to timeout for the first."""
+        if sys.platform == 'win32':
+            end = None if timeout is None else time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if end is not None and time.monotonic() >= end:
+                    return ''
+                time.sleep(0.01)
+            key = msvcrt.getwch()
+            if key == '\x03':
+                raise KeyboardInterrupt
+            if key in ('\x00', '\xe0'):  # Function or arrow key.
+                return '\x1b' + msvcrt.getwch()
+            return key
+        readable, _, _ = select.select([self._stdin], [], [], timeout)
+        if not readable:
+            return ''
+        data = os.read(self._stdin.fileno(), 64)
+        if not data:
+            raise EOFError
+        return data.decode('utf-8', errors='replace')
@@ -0,0 +1,225 @@
+"""Compact, random-access word sources for Hangman-CLI game.
+
+A WordStore holds a list of words in one contiguous bytes object, with an
+array of offsets into it, rather than as one str object per word. It is
+used in place of list[str] for large word lists.
+
+A MappedWordList reads words directly from a memory-mapped word list file,
+one word per line. Only an index of the start offsets of lines that hold a
+single word of at least min_len letters is held in memory, and it is cached
+on disk so that it is built only once for each version of the file. Other
+lines, such as blank lines, short words and phrases, are skipped. Picking a
+random word is O(1), and resident memory stays roughly flat whatever the
+size of the file.
+
+A ShuffleBag draws words from a sequence in random order, without
+repeats until every word has been drawn.
+"""
+
+import mmap
+import re
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from random import Random
+from typing import overload
+
+from filecache import cache_name, load_cached
+
+# Increment when the format of the cached index changes.
+_INDEX_VERSION = 3
+
+# A line holding one run of non-space characters, with any white space
+# around it.
+_WORD_LINE = re.compile(rb'^[ \t]*(\S+)[ \t\r]*$', re.MULTILINE)
+
+
+def _is_word(word: bytes, encoding: str, min_len: int) -> bool:
+    """Return True if word, in encoding, is at least min_len letters."""
+    if word.isascii():
+        return len(word) >= min_len and word.isalpha()
+    text = word.decode(encoding, 'replace')
+    return len(text) >= min_len and text.isalpha()
+
+
+def _line_offsets(data: bytes | mmap.mmap, encoding: str,
+                  min_len: int) -> array:
+    """Return array of start offsets of the lines in data that hold a
+    single word of at least min_len letters."""
+    typecode = 'I' if len(data) < 2 ** 32 else 'Q'
+    return array(typecode, (match.start()
+                            for match in _WORD_LINE.finditer(data)
+                            if _is_word(match.group(1), encoding, min_len)))
+
+
+class WordSequence(Sequence[str]):
+    """Base class for read-only sequences of words stored as bytes.
+
+    Subclasses implement _word() to decode a single word.
+    """
+
+    def _word(self, index: int) -> str:
+        raise NotImplementedError
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._word(idx)
+                    for idx in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._word(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in range(len(self)):
+            yield self._word(idx)
+
+
+class WordStore(WordSequence):
+    """Read-only sequence of words packed into a single bytes object.
+
+    The words are stored UTF-8 encoded and separated by newlines, with an
+    array of the start offset of each word.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        """Pack words into the store.
+
+        Parameters
+        ----------
+        words: Iterable[str]
+            The words. They must not contain newlines.
+        """
+        encoded = [word.encode() for word in words]
+        self._data = b'\n'.join(encoded)
+        typecode = 'I' if len(self._data) < 2 ** 32 - 1 else 'Q'
+        # Offsets has an extra entry, so word i ends at offsets[i + 1] - 1.
+        self._offsets = array(typecode, [0])
+        end = 0
+        for word in encoded:
+            end += len(word) + 1
+            self._offsets.append(end)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _word(self, index: int) -> str:
+        return self._data[self._offsets[index]:
+                          self._offsets[index + 1] - 1].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._data or len(self):
+            yield from self._data.decode().split('\n')
+
+
+class MappedWordList(WordSequence):
+    """Read-only sequence of the words of a memory-mapped file.
+
+    Only lines that hold a single word of at least min_len letters are
+    included. Words
+    are stripped of surrounding white space and converted to upper case
+    when read.
+    """
+
+    def __init__(self, file_name: Path, encoding: str = 'utf-8',
+                 min_len: int = 3) -> None:
+        """Map file_name and load (or build) its line index.
+
+        Parameters
+        ----------
+        file_name: Path
+            The word list file.
+        encoding: str
+            Text encoding of the file.
+        min_len: int
+            Length of the shortest word included.
+        """
+        self._encoding = encoding
+        self._data: bytes | mmap.mmap
+        with open(file_name, 'rb') as file:
+            try:
+                self._data = mmap.mmap(file.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file cannot be mapped.
+                self._data = b''
+        self._offsets: array = load_cached(
+            cache_name(f'lines-{encoding}-{min_len}', file_name),
+            (file_name,), _INDEX_VERSION,
+            lambda: _line_offsets(self._data, encoding, min_len))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _word(self, index: int) -> str:
+        start = self._offsets[index]
+        end = self._data.find(b'\n', start)
+        if end == -1:
+            end = len(self._data)
+        line = self._data[start:end].decode(self._encoding, 'replace')
+        return line.strip().upper()
+
+
+class ShuffleBag:
+    """Random draws from a sequence of words, without repeats.
+
+    The words are shuffled lazily with a Fisher-Yates shuffle, one step
+    per draw, so each draw is O(1). Rather than a permutation of every
+    index, only the positions that a draw has displaced are stored, so
+    the bag holds one dict entry per word drawn, however large the
+    sequence. When every word has been drawn, the bag is refilled.
+
+    Attributes
+    ----------
+    words : Sequence[str]
+        The words drawn from.
+    """
+
+    def __init__(self, words: Sequence[str],
+                 rng: Random | None = None) -> None:
+        """Initialise ShuffleBag.
+
+        Parameters
+        ----------
+        words: Sequence[str]
+            The words to draw from.
+        rng: Random | None
+            Random number generator, default: a new unseeded Random.
+        """
+        self.words = words
+        self._rng = rng or Random()
+        # Index held at each displaced position of the unshuffled part.
+        self._moved: dict[int, int] = {}
+        self._remaining = 0
+
+    def __len__(self) -> int:
+        """Number of words left to draw before the bag is refilled."""
+        return self._remaining
+
+    def draw(self) -> str:
+        """Return a word that has not been drawn since the last refill.
+
+        Raises
+        ------
+        IndexError
+            If there are no words.
+        """
+        if not self._remaining:
+            if not self.words:
+                raise IndexError("No words to draw from.")
+            self._remaining = len(self.words)
+            self._moved.clear()
+        moved = self._moved
+        pick = self._rng.randrange(self._remaining)
+        self._remaining -= 1
+        last = self._remaining
+        index = moved.pop(pick, pick)
+        if pick != last:
+            moved[pick] = moved.pop(last, last)
+        return self.words[index]